@@ -0,0 +1,195 @@
+import threading
+import time
+
+import config
+
+# Admission decisions
+ADMITTED = "admitted"
+DEGRADED = "degraded"
+SHED = "shed"
+
+_local = threading.local()
+
+
+def set_current(ticket):
+    """Make ticket the one LLM calls started on this thread are counted against"""
+    _local.ticket = ticket
+
+
+def current():
+    return getattr(_local, "ticket", None)
+
+
+class AdmissionTicket:
+    """Outcome of an admission decision for a single request"""
+
+    def __init__(self, controller, route, decision, queue_wait):
+        self.controller = controller
+        self.route = route
+        self.decision = decision
+        self.queue_wait = queue_wait
+        self._lock = threading.Lock()
+        self._holds = 0
+        self._released = False
+
+    @property
+    def degraded(self):
+        return self.decision != ADMITTED
+
+    @property
+    def shed(self):
+        return self.decision == SHED
+
+    def hold(self):
+        """Keep the slot until a matching unhold(), even if the request releases it first.
+
+        Returns False when there is no slot to keep.
+        """
+        with self._lock:
+            if self.decision != ADMITTED or self._released:
+                return False
+            self._holds += 1
+            return True
+
+    def unhold(self):
+        with self._lock:
+            self._holds -= 1
+            free = self._released and not self._holds
+        if free:
+            self.controller._release(self.route)
+
+    def release(self):
+        """Give the LLM slot back (only admitted tickets hold one) once no held call is running"""
+        if current() is self:
+            set_current(None)
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+            free = self.decision == ADMITTED and not self._holds
+        if free:
+            self.controller._release(self.route)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+class AdmissionController:
+    """Bound in-flight LLM calls per route and degrade or shed above thresholds"""
+
+    def __init__(self, max_inflight=16, shed_threshold=32, max_queue_wait=2.0,
+                 route_limits=None, default_route_limit=4, retry_after=5, queue_wait_half_life=5.0):
+        self.max_inflight = max_inflight
+        self.shed_threshold = shed_threshold
+        self.max_queue_wait = max_queue_wait
+        self.queue_wait_half_life = queue_wait_half_life
+        self.route_limits = dict(route_limits or {})
+        self.default_route_limit = default_route_limit
+        self.retry_after = retry_after
+
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._inflight = 0
+        self._waiting = 0
+        self._queue_wait_avg = 0.0
+        self._queue_wait_at = time.monotonic()
+        self._stats = {}
+
+    def _route_state(self, route):
+        # Caller holds self._lock
+        if route not in self._semaphores:
+            limit = self.route_limits.get(route, self.default_route_limit)
+            self._semaphores[route] = threading.BoundedSemaphore(limit)
+            self._stats[route] = {
+                "limit": limit,
+                "inflight": 0,
+                ADMITTED: 0,
+                DEGRADED: 0,
+                SHED: 0,
+            }
+        return self._semaphores[route], self._stats[route]
+
+    def _queue_pressure(self, now):
+        # Caller holds self._lock. The average halves every queue_wait_half_life
+        # seconds without samples, so a degraded (not queueing) system recovers.
+        elapsed = now - self._queue_wait_at
+        if elapsed > 0:
+            self._queue_wait_avg *= 0.5 ** (elapsed / self.queue_wait_half_life)
+            self._queue_wait_at = now
+        return self._queue_wait_avg
+
+    def admit(self, route, max_wait=None):
+        """Decide whether a request may use the LLM, should degrade, or be shed"""
+        if max_wait is None or max_wait > self.max_queue_wait:
+            max_wait = self.max_queue_wait
+        with self._lock:
+            semaphore, stats = self._route_state(route)
+            if self._inflight + self._waiting >= self.shed_threshold:
+                stats[SHED] += 1
+                return AdmissionTicket(self, route, SHED, 0.0)
+            if self._inflight >= self.max_inflight or self._queue_pressure(time.monotonic()) > self.max_queue_wait:
+                stats[DEGRADED] += 1
+                return AdmissionTicket(self, route, DEGRADED, 0.0)
+            self._waiting += 1
+
+        start = time.monotonic()
+        acquired = semaphore.acquire(timeout=max_wait)
+        end = time.monotonic()
+        queue_wait = end - start
+
+        with self._lock:
+            self._waiting -= 1
+            # Exponentially weighted average keeps a short memory of queue pressure
+            self._queue_wait_avg = 0.8 * self._queue_pressure(end) + 0.2 * queue_wait
+            if not acquired:
+                stats[DEGRADED] += 1
+                return AdmissionTicket(self, route, DEGRADED, queue_wait)
+            self._inflight += 1
+            stats["inflight"] += 1
+            stats[ADMITTED] += 1
+        return AdmissionTicket(self, route, ADMITTED, queue_wait)
+
+    def try_admit(self, route):
+        """Take a free slot for route without queueing; None when none is free"""
+        with self._lock:
+            semaphore, stats = self._route_state(route)
+            if self._inflight >= self.max_inflight or not semaphore.acquire(blocking=False):
+                return None
+            self._inflight += 1
+            stats["inflight"] += 1
+            stats[ADMITTED] += 1
+        return AdmissionTicket(self, route, ADMITTED, 0.0)
+
+    def _release(self, route):
+        with self._lock:
+            semaphore, stats = self._route_state(route)
+            self._inflight -= 1
+            stats["inflight"] -= 1
+        semaphore.release()
+
+    def snapshot(self):
+        """Return current load and per-route counters for monitoring"""
+        with self._lock:
+            return {
+                "inflight": self._inflight,
+                "waiting": self._waiting,
+                "avg_queue_wait": round(self._queue_pressure(time.monotonic()), 4),
+                "max_inflight": self.max_inflight,
+                "shed_threshold": self.shed_threshold,
+                "routes": {route: dict(stats) for route, stats in self._stats.items()},
+            }
+
+
+controller = AdmissionController(
+    max_inflight=config.ADMISSION_MAX_INFLIGHT,
+    shed_threshold=config.ADMISSION_SHED_THRESHOLD,
+    max_queue_wait=config.ADMISSION_MAX_QUEUE_WAIT,
+    route_limits=config.ADMISSION_ROUTE_LIMITS,
+    default_route_limit=config.ADMISSION_DEFAULT_ROUTE_LIMIT,
+    retry_after=config.ADMISSION_RETRY_AFTER,
+    queue_wait_half_life=config.ADMISSION_QUEUE_WAIT_HALF_LIFE,
+)
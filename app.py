@@ -1,8 +1,15 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, g, make_response, Response, stream_with_context
 import os
 import json
 from functools import wraps
 import config
+import admission
+import cache_warmer
+import circuit_breaker
+import deadline
+import http_cache
+import profiling
+import usage
 
 app = Flask(__name__)
 app.secret_key = 'intelligent_career_advisor_key'
@@ -13,6 +20,19 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload size
 if not os.environ.get('VERCEL'):
     os.makedirs('uploads', exist_ok=True)
 
+app.after_request(http_cache.finalize)
+
+@app.before_request
+def attribute_llm_usage():
+    # LLM tokens spent while handling this request are charged to this user
+    usage.set_user(session.get('user_id'))
+
+@app.before_request
+def start_cache_warmer():
+    # Started from a request so each server worker process gets its own thread
+    if config.CACHE_WARMER_ENABLED:
+        cache_warmer.warmer.start()
+
 # Predefined credentials for simple authentication
 PREDEFINED_EMAIL = "admin@careeradvisor.com"
 PREDEFINED_PASSWORD = "admin123"
@@ -26,9 +46,119 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def profiled(route):
+    """Profile the request when asked by header, admin toggle or sampling"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            trigger = profiling.should_profile(request.headers.get(config.PROFILING_HEADER))
+            profile = profiling.start(route, trigger) if trigger else None
+            if profile is None:
+                return f(*args, **kwargs)
+            with profile:
+                response = make_response(f(*args, **kwargs))
+            response.headers['X-Profile-Id'] = profile.id
+            return response
+        return decorated_function
+    return decorator
+
+def with_deadline(route):
+    """Give LLM-backed POST requests a time budget shared by every stage"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method == 'POST':
+                g.deadline = deadline.for_route(route)
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+def admission_controlled(route):
+    """Admit LLM-backed POST requests, degrading to local generators or shedding under load"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != 'POST':
+                return f(*args, **kwargs)
+            request_deadline = g.get('deadline')
+            max_wait = request_deadline.budget() if request_deadline else None
+            ticket = admission.controller.admit(route, max_wait=max_wait)
+            if ticket.shed and request.path.startswith('/api/'):
+                response = jsonify({'error': 'Server is busy, please retry later', 'degraded': True})
+                response.status_code = 429
+                response.headers['Retry-After'] = str(admission.controller.retry_after)
+                return response
+            g.admission = ticket
+            # LLM calls started for this request keep the slot until they finish
+            admission.set_current(ticket)
+            release_now = True
+            try:
+                response = f(*args, **kwargs)
+                if isinstance(response, Response) and response.is_streamed:
+                    # A streamed response keeps its slot until the last chunk is sent
+                    response.call_on_close(ticket.release)
+                    release_now = False
+                return response
+            finally:
+                if release_now:
+                    ticket.release()
+        return decorated_function
+    return decorator
+
+def budget_exhausted():
+    """Whether the current user has spent today's LLM token budget"""
+    return not usage.store.within_budget(usage.current_user())
+
+def llm_allowed():
+    """Whether the current request was admitted to use the LLM and is within budget"""
+    ticket = g.get('admission')
+    return (ticket is None or not ticket.degraded) and not budget_exhausted()
+
+def mark_degraded(result):
+    """Flag results served by the local fallback because of load or budget"""
+    if not llm_allowed():
+        if isinstance(result, dict):
+            result['degraded'] = True
+        if not request.path.startswith('/api/'):
+            if budget_exhausted():
+                flash("You have used today's AI allowance: showing quick results instead of the full AI analysis.", 'warning')
+            else:
+                flash('High demand right now: showing quick results instead of the full AI analysis.', 'warning')
+    return result
+
+def wants_stream():
+    """Whether the client asked for a newline-delimited JSON stream"""
+    return request.args.get('stream') == '1' or 'application/x-ndjson' in request.headers.get('Accept', '')
+
+def stream_ndjson(items, key):
+    """Stream each item as one JSON line as soon as it is ready, then a summary line
+    with the number of items and how many of them are local fallbacks"""
+    degraded = not llm_allowed()
+    def generate():
+        count = fallbacks = 0
+        for item in items:
+            count += 1
+            if isinstance(item, dict) and item.get('fallback'):
+                fallbacks += 1
+            yield json.dumps({key: item}) + '\n'
+        yield json.dumps({'done': True, 'count': count, 'degraded': degraded, 'fallbacks': fallbacks}) + '\n'
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def store_parsed_resume(result):
+    """Keep successfully parsed resumes for recruiter ranking, replacing earlier parses of the same resume"""
+    if config.RESUME_STORE_ENABLED and isinstance(result, dict) and 'error' not in result:
+        try:
+            import recruiter
+            recruiter.store.add(result)
+        except Exception as e:
+            print(f"[ERROR] Could not store parsed resume: {str(e)}")
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return http_cache.conditional_page('index.html')
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -67,10 +197,13 @@ def register():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    return render_template('dashboard.html')
+    return http_cache.conditional_page('dashboard.html')
 
 @app.route('/resume_parser', methods=['GET', 'POST'])
 @login_required
+@profiled('resume')
+@with_deadline('resume')
+@admission_controlled('resume')
 def resume_parser_page():
     if request.method == 'POST':
         if 'resume' not in request.files:
@@ -86,8 +219,10 @@ def resume_parser_page():
             # Process the resume file
             try:
                 import resume_parser
-                result = resume_parser.parse_resume_file(file)
-                return render_template('resume_parser_result.html', result=result)
+                result = mark_degraded(resume_parser.parse_resume_file(file, use_ai=llm_allowed(), deadline=g.get('deadline')))
+                store_parsed_resume(result)
+                with profiling.span('render'):
+                    return render_template('resume_parser_result.html', result=result)
             except Exception as e:
                 flash(f'Error processing resume: {str(e)}', 'danger')
                 return redirect(request.url)
@@ -96,16 +231,21 @@ def resume_parser_page():
 
 @app.route('/job_matcher', methods=['GET', 'POST'])
 @login_required
+@profiled('jobs')
+@with_deadline('jobs')
+@admission_controlled('jobs')
 def job_matcher_page():
     if request.method == 'POST':
         job_position = request.form.get('job_position', '')
         location = request.form.get('location', '')
         skills = request.form.get('skills', '')
         
+        cache_warmer.log_request('find_jobs', job_position=job_position, location=location, skills=skills)
         try:
             import job_matcher
-            matches = job_matcher.find_job_matches(job_position, location, skills)
-            return render_template('job_matcher.html', matches=matches, submitted=True)
+            matches = mark_degraded(job_matcher.find_job_matches(job_position, location, skills, use_ai=llm_allowed(), deadline=g.get('deadline')))
+            with profiling.span('render'):
+                return render_template('job_matcher.html', matches=matches, submitted=True)
         except Exception as e:
             flash(f'Error finding job matches: {str(e)}', 'danger')
     
@@ -113,6 +253,9 @@ def job_matcher_page():
 
 @app.route('/career_guidance', methods=['GET', 'POST'])
 @login_required
+@profiled('guidance')
+@with_deadline('guidance')
+@admission_controlled('guidance')
 def career_guidance_page():
     if request.method == 'POST':
         current_role = request.form.get('current_role', '')
@@ -120,10 +263,12 @@ def career_guidance_page():
         skills = request.form.get('skills', '')
         interests = request.form.get('interests', '')
         
+        cache_warmer.log_request('career_guidance', current_role=current_role, experience_years=experience_years, skills=skills, interests=interests)
         try:
             import career_guidance
-            guidance = career_guidance.get_career_guidance(current_role, experience_years, skills, interests)
-            return render_template('career_guidance.html', guidance=guidance, submitted=True)
+            guidance = mark_degraded(career_guidance.get_career_guidance(current_role, experience_years, skills, interests, use_ai=llm_allowed(), deadline=g.get('deadline')))
+            with profiling.span('render'):
+                return render_template('career_guidance.html', guidance=guidance, submitted=True)
         except Exception as e:
             flash(f'Error generating career guidance: {str(e)}', 'danger')
     
@@ -131,15 +276,20 @@ def career_guidance_page():
 
 @app.route('/interview_prep', methods=['GET', 'POST'])
 @login_required
+@profiled('interview_questions')
+@with_deadline('interview_questions')
+@admission_controlled('interview_questions')
 def interview_prep_page():
     if request.method == 'POST':
         job_role = request.form.get('job_role', '')
         experience_level = request.form.get('experience_level', '')
         
+        cache_warmer.log_request('interview_questions', job_role=job_role, experience_level=experience_level)
         try:
             import interview_prep
-            questions = interview_prep.get_interview_questions(job_role, experience_level)
-            return render_template('interview_prep.html', questions=questions, submitted=True)
+            questions = mark_degraded(interview_prep.get_interview_questions(job_role, experience_level, use_ai=llm_allowed(), deadline=g.get('deadline')))
+            with profiling.span('render'):
+                return render_template('interview_prep.html', questions=questions, submitted=True)
         except Exception as e:
             flash(f'Error generating interview questions: {str(e)}', 'danger')
     
@@ -147,6 +297,9 @@ def interview_prep_page():
 
 @app.route('/interview_chatbot', methods=['GET', 'POST'])
 @login_required
+@profiled('interview_chat')
+@with_deadline('interview_chat')
+@admission_controlled('interview_chat')
 def interview_chatbot_page():
     if request.method == 'POST':
         message = request.form.get('message', '')
@@ -154,8 +307,9 @@ def interview_chatbot_page():
         
         try:
             import interview_prep2
-            response = interview_prep2.chat_with_interview_bot(message, job_role)
-            return render_template('interview_chatbot.html', response=response, message=message)
+            response = mark_degraded(interview_prep2.chat_with_interview_bot(message, job_role, use_ai=llm_allowed(), deadline=g.get('deadline')))
+            with profiling.span('render'):
+                return render_template('interview_chatbot.html', response=response, message=message)
         except Exception as e:
             flash(f'Error in chatbot: {str(e)}', 'danger')
     
@@ -164,34 +318,49 @@ def interview_chatbot_page():
 # API endpoints for AJAX calls
 @app.route('/api/process_resume', methods=['POST'])
 @login_required
+@profiled('resume')
+@with_deadline('resume')
+@admission_controlled('resume')
 def process_resume():
     try:
         data = request.get_json()
         resume_text = data.get('resume_text', '')
         
         import resume_parser
-        result = resume_parser.parse_resume_text(resume_text)
-        return jsonify(result)
+        result = mark_degraded(resume_parser.parse_resume_text(resume_text, use_ai=llm_allowed(), deadline=g.get('deadline')))
+        store_parsed_resume(result)
+        with profiling.span('render'):
+            return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/find_jobs', methods=['POST'])
 @login_required
+@profiled('jobs')
+@with_deadline('jobs')
+@admission_controlled('jobs')
 def find_jobs():
     try:
         data = request.get_json()
         job_position = data.get('job_position', '')
         location = data.get('location', '')
         skills = data.get('skills', '')
+        cache_warmer.log_request('find_jobs', job_position=job_position, location=location, skills=skills)
         
         import job_matcher
-        matches = job_matcher.find_job_matches(job_position, location, skills)
-        return jsonify(matches)
+        if wants_stream():
+            return stream_ndjson(job_matcher.stream_job_matches(job_position, location, skills, use_ai=llm_allowed(), deadline=g.get('deadline')), 'job')
+        matches = mark_degraded(job_matcher.find_job_matches(job_position, location, skills, use_ai=llm_allowed(), deadline=g.get('deadline')))
+        with profiling.span('render'):
+            return jsonify(matches)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/career_guidance', methods=['POST'])
 @login_required
+@profiled('guidance')
+@with_deadline('guidance')
+@admission_controlled('guidance')
 def get_guidance():
     try:
         data = request.get_json()
@@ -199,15 +368,20 @@ def get_guidance():
         experience_years = data.get('experience_years', '')
         skills = data.get('skills', '')
         interests = data.get('interests', '')
+        cache_warmer.log_request('career_guidance', current_role=current_role, experience_years=experience_years, skills=skills, interests=interests)
         
         import career_guidance
-        guidance = career_guidance.get_career_guidance(current_role, experience_years, skills, interests)
-        return jsonify(guidance)
+        guidance = mark_degraded(career_guidance.get_career_guidance(current_role, experience_years, skills, interests, use_ai=llm_allowed(), deadline=g.get('deadline')))
+        with profiling.span('render'):
+            return jsonify(guidance)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/interview_chat', methods=['POST'])
 @login_required
+@profiled('interview_chat')
+@with_deadline('interview_chat')
+@admission_controlled('interview_chat')
 def interview_chat():
     try:
         data = request.get_json()
@@ -215,10 +389,144 @@ def interview_chat():
         job_role = data.get('job_role', 'Software Engineer')
         
         import interview_prep2
-        response = interview_prep2.chat_with_interview_bot(message, job_role)
-        return jsonify({'response': response})
+        response = mark_degraded(interview_prep2.chat_with_interview_bot(message, job_role, use_ai=llm_allowed(), deadline=g.get('deadline')))
+        with profiling.span('render'):
+            return jsonify({'response': response, 'degraded': not llm_allowed()})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def batch_queries():
+    """Return the queries array of a batch request, or an error message"""
+    data = request.get_json(silent=True) or {}
+    queries = data.get('queries')
+    if not isinstance(queries, list) or not queries:
+        return None, "'queries' must be a non-empty array"
+    if len(queries) > config.BATCH_MAX_ITEMS:
+        return None, f"A batch may contain at most {config.BATCH_MAX_ITEMS} queries"
+    return queries, None
+
+@app.route('/api/find_jobs/batch', methods=['POST'])
+@login_required
+@profiled('jobs_batch')
+@with_deadline('jobs_batch')
+@admission_controlled('jobs')
+def find_jobs_batch():
+    queries, error = batch_queries()
+    if error:
+        return jsonify({'error': error}), 400
+    try:
+        import job_matcher
+        result = mark_degraded(job_matcher.find_job_matches_batch(queries, use_ai=llm_allowed(), deadline=g.get('deadline')))
+        with profiling.span('render'):
+            return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/career_guidance/batch', methods=['POST'])
+@login_required
+@profiled('guidance_batch')
+@with_deadline('guidance_batch')
+@admission_controlled('guidance')
+def get_guidance_batch():
+    queries, error = batch_queries()
+    if error:
+        return jsonify({'error': error}), 400
+    try:
+        import career_guidance
+        result = mark_degraded(career_guidance.get_career_guidance_batch(queries, use_ai=llm_allowed(), deadline=g.get('deadline')))
+        with profiling.span('render'):
+            return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/recruiter/rank', methods=['POST'])
+@login_required
+def rank_candidates():
+    try:
+        data = request.get_json(silent=True) or {}
+        job_description = data.get('job_description', '')
+        if not job_description:
+            return jsonify({'error': "'job_description' is required"}), 400
+        try:
+            top_k = max(1, min(int(data.get('top_k', 10)), 500))
+            page = max(1, int(data.get('page', 1)))
+        except (TypeError, ValueError):
+            return jsonify({'error': "'top_k' and 'page' must be integers"}), 400
+
+        import recruiter
+        result = recruiter.rank_resumes(job_description, recruiter.store.features(), top=top_k, page=page)
+        with profiling.span('render'):
+            return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/admission')
+@login_required
+def admission_status():
+    return jsonify(admission.controller.snapshot())
+
+@app.route('/api/admin/cache')
+@login_required
+def cache_status():
+    import semantic_cache
+    stats = semantic_cache.cache.stats()
+    stats['resumes'] = semantic_cache.resume_cache.stats()
+    return jsonify(stats)
+
+@app.route('/api/admin/cache_warmer', methods=['GET', 'POST'])
+@login_required
+def cache_warmer_status():
+    if request.method == 'POST':
+        cache_warmer.warmer.start()
+        cache_warmer.warmer.trigger()
+    return jsonify(cache_warmer.warmer.snapshot())
+
+@app.route('/api/admin/usage')
+@login_required
+def usage_status():
+    user = usage.current_user()
+    try:
+        report = usage.store.report(request.args.get('day'), request.args.get('by', 'user'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    report['you'] = {'user': user, 'tokens_today': usage.store.tokens_today(user), 'budget': usage.budget_for(user or 'anonymous')}
+    return jsonify(report)
+
+@app.route('/api/admin/http_cache')
+@login_required
+def http_cache_status():
+    return jsonify(http_cache.stats())
+
+@app.route('/api/admin/profiling', methods=['GET', 'POST'])
+@login_required
+def profiling_status():
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        if 'enabled' in data:
+            profiling.settings['enabled'] = bool(data['enabled'])
+        if 'sample_rate' in data:
+            try:
+                profiling.settings['sample_rate'] = min(max(float(data['sample_rate']), 0.0), 1.0)
+            except (TypeError, ValueError):
+                return jsonify({'error': "'sample_rate' must be a number between 0 and 1"}), 400
+    return jsonify(profiling.snapshot())
+
+@app.route('/api/admin/chatbot')
+@login_required
+def chatbot_status():
+    import intent_classifier
+    return jsonify(intent_classifier.stats())
+
+@app.route('/api/admin/llm_routes')
+@login_required
+def llm_route_status():
+    import llm_router
+    return jsonify(llm_router.router.snapshot())
+
+@app.route('/api/admin/circuit_breakers')
+@login_required
+def circuit_breaker_status():
+    return jsonify(circuit_breaker.snapshot())
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000))) 
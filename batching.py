@@ -0,0 +1,172 @@
+import json
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import admission
+import config
+import semantic_cache
+import usage
+
+
+def dedupe(keys):
+    """Return the unique keys in first-seen order and, per key, the input positions using it"""
+    positions = {}
+    for index, key in enumerate(keys):
+        positions.setdefault(key, []).append(index)
+    return list(positions), positions
+
+
+def pack(items, size_fn, max_items=None, max_chars=None):
+    """Group items into chunks for one prompt each; oversized items get a chunk of their own"""
+    max_items = max_items or config.BATCH_PACK_SIZE
+    max_chars = max_chars or config.BATCH_PACK_MAX_CHARS
+    chunks = []
+    current = []
+    current_chars = 0
+    for item in items:
+        size = size_fn(item)
+        if size > max_chars:
+            chunks.append([item])
+            continue
+        if current and (len(current) >= max_items or current_chars + size > max_chars):
+            chunks.append(current)
+            current = []
+            current_chars = 0
+        current.append(item)
+        current_chars += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def query_id(position):
+    return f"q{position}"
+
+
+def build_packed_prompt(task, query_lines, item_schema):
+    """Build one prompt answering several queries, keyed by query id"""
+    queries = "\n".join(f"{query_id(i)}: {line}" for i, line in enumerate(query_lines))
+    ids = ", ".join(f'"{query_id(i)}"' for i in range(len(query_lines)))
+    return f"""
+    {task}
+
+    Queries:
+    {queries}
+
+    Return a single JSON object with exactly one key per query id ({ids}).
+    Answer every query independently. The value for each key must have the following structure:
+    {item_schema}
+
+    Return only the JSON object.
+    """
+
+
+def split_packed_response(text, count):
+    """Split a packed JSON response into per-query results (None where missing)"""
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        return [None] * count
+    return [data.get(query_id(i)) for i in range(count)]
+
+
+def run_chunks(chunks, handler, route=None):
+    """Run handler over chunks with bounded parallelism, preserving order.
+
+    The calling request already holds one admission slot for route. Every
+    further parallel call needs a free slot of its own, so the fan-out counts
+    against the route's concurrency limit.
+    """
+    parallel = min(config.BATCH_MAX_PARALLEL_CALLS, len(chunks))
+    tickets = []
+    if route is not None:
+        while len(tickets) + 1 < parallel:
+            ticket = admission.controller.try_admit(route)
+            if ticket is None:
+                break
+            tickets.append(ticket)
+        parallel = len(tickets) + 1
+    try:
+        if parallel <= 1:
+            return [handler(chunk) for chunk in chunks]
+        # Pool threads charge their LLM calls to the user of the calling request,
+        # and each running chunk counts against one of the admission tickets
+        user = usage.current_user()
+        free = queue.Queue()
+        for ticket in [admission.current()] + tickets:
+            free.put(ticket)
+
+        def run(chunk):
+            usage.set_user(user)
+            ticket = free.get()
+            admission.set_current(ticket)
+            try:
+                return handler(chunk)
+            finally:
+                admission.set_current(None)
+                free.put(ticket)
+
+        with ThreadPoolExecutor(max_workers=parallel) as pool:
+            return list(pool.map(run, chunks))
+    finally:
+        for ticket in tickets:
+            ticket.release()
+
+
+def run_batch(queries, fields, answer_packed, fallback, use_ai=True, needs_ai=None, route=None,
+              feature=None, cache_key=None):
+    """Answer a batch of query objects, packing the LLM-eligible ones into shared prompts.
+
+    With feature and cache_key, keys already in the semantic cache under
+    feature (looked up with cache_key(*key)) are answered from it, and the
+    answers the LLM gives are stored there. answer_packed(chunk) returns a
+    result or None per key in the chunk. Keys it leaves unanswered get
+    fallback(*key) flagged with "fallback": true, and an "error" if the
+    fallback fails too.
+    """
+    results = [None] * len(queries)
+    keys = []
+    positions = []
+    for index, query in enumerate(queries):
+        if not isinstance(query, dict):
+            results[index] = {"error": "Each query must be a JSON object"}
+            continue
+        keys.append(tuple(str(query.get(field, '')).strip() for field in fields))
+        positions.append(index)
+
+    unique, uses = dedupe(keys)
+    answers = {}
+    if feature is not None:
+        for key in unique:
+            cached = semantic_cache.cache.get(feature, cache_key(*key))
+            if cached is not None:
+                answers[key] = cached
+    cache_hits = len(answers)
+    chunks = []
+    if use_ai:
+        ai_queries = [key for key in unique if key not in answers and (needs_ai is None or needs_ai(key))]
+        chunks = pack(ai_queries, lambda key: sum(len(part) for part in key))
+        for chunk, chunk_answers in zip(chunks, run_chunks(chunks, answer_packed, route)):
+            for key, answer in zip(chunk, chunk_answers):
+                if answer:
+                    answers[key] = answer
+                    if feature is not None:
+                        semantic_cache.cache.put(feature, cache_key(*key), answer)
+
+    fallbacks = 0
+    for key in unique:
+        if answers.get(key):
+            item = {"result": answers[key]}
+        else:
+            try:
+                item = {"result": fallback(*key), "fallback": True}
+                fallbacks += 1
+            except Exception as e:
+                item = {"error": str(e)}
+        for use in uses[key]:
+            results[positions[use]] = item
+
+    return {
+        "results": results,
+        "stats": {"items": len(queries), "unique": len(unique), "cache_hits": cache_hits, "llm_calls": len(chunks),
+                  "fallbacks": fallbacks}
+    }
@@ -0,0 +1,100 @@
+"""Bytes on the wire and render time of pages, before and after HTTP caching.
+
+Requests each page through the Flask test client three ways:
+
+- "before": compression and the page cache off, a full body every time
+- "gzip": a first visit with Accept-Encoding: gzip
+- "revisit": a repeat visit that sends back the ETag it got
+
+Only pages with an ETag (/ and /dashboard) can answer a revisit with 304.
+
+    python benchmarks/bench_http.py --runs 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import config  # noqa: E402
+import http_cache  # noqa: E402
+from app import app  # noqa: E402
+
+# (label, method, path, logged in, body)
+PAGES = [
+    ("index (anonymous)", "GET", "/", False, None),
+    ("index (logged in)", "GET", "/", True, None),
+    ("dashboard", "GET", "/dashboard", True, None),
+    ("login", "GET", "/login", False, None),
+    ("career_guidance", "GET", "/career_guidance", True, None),
+    ("resume_parser", "GET", "/resume_parser", True, None),
+    ("interview_prep", "GET", "/interview_prep", True, None),
+    ("job_matcher", "GET", "/job_matcher", True, None),
+    ("api/find_jobs (mock)", "POST", "/api/find_jobs", True,
+     {"job_position": "Software Engineer", "location": "Remote", "skills": "Python, SQL"}),
+]
+
+
+def client(logged_in):
+    test_client = app.test_client()
+    if logged_in:
+        with test_client.session_transaction() as session:
+            session["user_id"] = 1
+            session["email"] = "admin@careeradvisor.com"
+    return test_client
+
+
+def measure(label, method, path, logged_in, body, runs, mode):
+    compression = mode != "before"
+    config.COMPRESSION_ENABLED = compression
+    config.PAGE_CACHE_ENABLED = compression
+    http_cache.clear()
+    test_client = client(logged_in)
+    headers = {"Accept-Encoding": "gzip"} if compression else {}
+    if mode == "revisit":
+        etag = test_client.open(path, method=method, headers=headers, json=body).headers.get("ETag")
+        if etag:
+            headers["If-None-Match"] = etag
+
+    times = []
+    size = status = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = test_client.open(path, method=method, headers=headers, json=body)
+        times.append(time.perf_counter() - start)
+        size, status = len(response.get_data()), response.status_code
+    return statistics.median(times) * 1000, size, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            rows = []
+            for page in PAGES:
+                rows.append((page[0],) + tuple(measure(*page, args.runs, mode)
+                                               for mode in ("before", "gzip", "revisit")))
+        finally:
+            sys.stdout = stdout
+
+    print(f"{'page':<24}{'before':>20}{'gzip':>20}{'revisit':>24}")
+    for label, before, compressed, revisit in rows:
+        cells = [f"{size:>7d} B {ms:6.2f} ms" for ms, size, _ in (before, compressed)]
+        cells.append(f"{revisit[1]:>7d} B {revisit[0]:6.2f} ms ({revisit[2]})")
+        print(f"{label:<24}{cells[0]:>20}{cells[1]:>20}{cells[2]:>24}")
+    total_before = sum(row[1][1] for row in rows)
+    total_after = sum(row[2][1] for row in rows)
+    print(f"\nbytes per first visit to every page: {total_before} -> {total_after} "
+          f"({100 * (1 - total_after / total_before):.0f}% less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Throughput of parse_resume_basic on realistic and worst-case inputs.
+
+Compares the line-oriented segmenter with the previous backtracking regexes
+(reproduced below as LEGACY_*) and checks parse_resume_basic against the
+throughput target. Each input is timed --repeat times and the fastest run is
+reported, so one slow run on a busy machine does not fail the check. Exits
+non-zero when the target is missed.
+
+    python benchmarks/bench_parser.py --size-kb 512 --repeat 5
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_parser  # noqa: E402
+
+# Minimum parse_resume_basic throughput on every input, in MB/s
+THROUGHPUT_TARGET_MB_S = 1.0
+
+LEGACY_EDUCATION_PATTERNS = [
+    r'(Bachelor|Master|PhD|B\.S\.|M\.S\.|B\.A\.|M\.A\.).*?(University|College|Institute)',
+    r'(University|College|Institute).*?(Bachelor|Master|PhD|B\.S\.|M\.S\.|B\.A\.|M\.A\.)',
+]
+LEGACY_EXPERIENCE_PATTERNS = [
+    r'(Software Engineer|Developer|Programmer|Manager|Analyst|Consultant).*?(Company|Corp|Inc|LLC)',
+    r'(Company|Corp|Inc|LLC).*?(Software Engineer|Developer|Programmer|Manager|Analyst|Consultant)',
+]
+
+SAMPLE_RESUME = """John Smith
+john.smith@example.com | (555) 123-4567
+
+EXPERIENCE
+Senior Software Engineer | Acme Corp | Jan 2019 - Present
+• Built payment APIs in Python and Go
+• Led the migration of 40 services to Kubernetes
+Software Developer at Initech LLC
+2015 - 2018
+- Maintained Java services and SQL reporting
+
+EDUCATION
+Bachelor of Science in Computer Science
+State University, 2011 - 2015
+
+SKILLS
+Python, Java, Docker, AWS, React, SQL
+"""
+
+
+def legacy_sections(text):
+    found = 0
+    for pattern in LEGACY_EDUCATION_PATTERNS + LEGACY_EXPERIENCE_PATTERNS:
+        found += sum(1 for _ in re.finditer(pattern, text, re.IGNORECASE))
+    return found
+
+
+def inputs(size):
+    """Realistic and adversarial texts of roughly size bytes"""
+    return {
+        "realistic resumes": (SAMPLE_RESUME * (size // len(SAMPLE_RESUME) + 1))[:size],
+        "one line, degrees only": ("Bachelor " * (size // 9 + 1))[:size],
+        "one line, titles only": ("Developer " * (size // 10 + 1))[:size],
+        "many short lines": ("Master\n" * (size // 7 + 1))[:size],
+    }
+
+
+def timed(fn, text, repeat, budget=10.0):
+    """Fastest of repeat runs in seconds; inf as soon as one run exceeds the budget"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget:
+            return float("inf")
+        best = min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--legacy-size-kb", type=int, default=64,
+                        help="Input size for the legacy regexes (they are quadratic on some inputs)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per input; the fastest is reported")
+    args = parser.parse_args()
+
+    print(f"{'input':<26}{'legacy MB/s':>14}{'parse_resume_basic MB/s':>26}")
+    failed = False
+    legacy_texts = inputs(args.legacy_size_kb * 1024)
+    for name, text in inputs(args.size_kb * 1024).items():
+        legacy_text = legacy_texts[name]
+        legacy = len(legacy_text) / 1e6 / timed(legacy_sections, legacy_text, args.repeat)
+        current = len(text) / 1e6 / timed(resume_parser.parse_resume_basic, text, args.repeat)
+        failed = failed or current < THROUGHPUT_TARGET_MB_S
+        print(f"{name:<26}{legacy:>14.2f}{current:>26.2f}")
+
+    print(f"target: {THROUGHPUT_TARGET_MB_S} MB/s -> {'FAIL' if failed else 'ok'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Peak Python memory of resume PDF handling on a large document.
+
+Builds a synthetic PDF with fitz and measures, with tracemalloc, the peak
+allocation of the previous concatenating pipeline against the page generator
+(iter_pdf_pages + get_resume_prompt + parse_resume_pages). Both read the same
+page and character budget and build the same prompt, so the difference is
+the streaming alone. Exits non-zero when the per-request peak of the page
+generator exceeds PEAK_BUDGET_MB.
+
+    python benchmarks/bench_pdf_memory.py --pages 400 --max-pages 50
+"""
+import argparse
+import functools
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import resume_parser  # noqa: E402
+
+# Maximum traced peak for one request on the budgeted pipeline, in MB
+PEAK_BUDGET_MB = 8.0
+
+PAGE_LINES = [
+    "Senior Software Engineer | Acme Corp | Jan 2019 - Present",
+    "• Built payment APIs in Python and Go, running on AWS with Docker",
+    "• Led the migration of 40 services to Kubernetes and Terraform",
+    "Bachelor of Science in Computer Science, State University, 2011 - 2015",
+]
+
+
+def build_pdf(path, pages, lines_per_page):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        text = "\n".join(PAGE_LINES[i % len(PAGE_LINES)] for i in range(lines_per_page))
+        page.insert_text((20, 20), f"Page {number}\n{text}", fontsize=5)
+    doc.save(path)
+    doc.close()
+
+
+def legacy_pipeline(path, max_pages, max_chars):
+    """The previous flow: the budgeted pages concatenated into one string"""
+    doc = fitz.open(path)
+    text = ""
+    for page_num, page in enumerate(doc, 1):
+        if page_num > max_pages or len(text) >= max_chars:
+            break
+        text += page.get_text()
+    doc.close()
+    text = text[:max_chars]
+    prompt = resume_parser.get_resume_prompt(text)
+    resume_parser.parse_resume_basic(text)
+    return len(text), len(prompt)
+
+
+def generator_pipeline(path, max_pages, max_chars):
+    pages = list(resume_parser.iter_pdf_pages(path, max_chars=max_chars, max_pages=max_pages))
+    prompt = resume_parser.get_resume_prompt(pages)
+    resume_parser.parse_resume_pages(pages)
+    return sum(len(page_text) for page_text in pages), len(prompt)
+
+
+def measure(fn, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    text_chars, prompt_chars = fn(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6, elapsed, text_chars, prompt_chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--lines-per-page", type=int, default=150)
+    parser.add_argument("--max-pages", type=int, default=config.PDF_MAX_PAGES)
+    parser.add_argument("--max-chars", type=int, default=config.PDF_MAX_CHARS)
+    args = parser.parse_args()
+    budget = {"max_pages": args.max_pages, "max_chars": args.max_chars}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.pdf")
+        build_pdf(path, args.pages, args.lines_per_page)
+        print(f"document: {args.pages} pages, {os.path.getsize(path) / 1e6:.1f} MB on disk")
+        print(f"budget: {args.max_pages} pages, {args.max_chars} characters")
+
+        # Silence the per-page debug output while measuring
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                results = {
+                    "legacy (concatenate)": measure(functools.partial(legacy_pipeline, **budget), path),
+                    "page generator": measure(functools.partial(generator_pipeline, **budget), path),
+                }
+            finally:
+                sys.stdout = stdout
+
+    print(f"{'pipeline':<24}{'peak MB':>10}{'seconds':>10}{'text chars':>13}{'prompt chars':>15}")
+    for name, (peak, elapsed, text_chars, prompt_chars) in results.items():
+        print(f"{name:<24}{peak:>10.1f}{elapsed:>10.2f}{text_chars:>13}{prompt_chars:>15}")
+
+    # Both pipelines must have read the same text for the comparison to hold
+    sizes = {result[2:] for result in results.values()}
+    if len(sizes) != 1:
+        print(f"[ERROR] Pipelines read different amounts of text: {sorted(sizes)}")
+        sys.exit(1)
+
+    peak = results["page generator"][0]
+    failed = peak > PEAK_BUDGET_MB
+    print(f"peak budget: {PEAK_BUDGET_MB} MB per request -> {'FAIL' if failed else 'ok'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
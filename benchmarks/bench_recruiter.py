@@ -0,0 +1,101 @@
+"""Recruiter ranking throughput on a synthetic store of parsed resumes.
+
+Builds the feature matrix once (as the running app does) and times ranking
+the whole store against a job description, then times the first ranking
+after each of --uploads new resumes is appended to a JSON-lines store.
+Target: 50k resumes ranked in under one second on a single core, including
+right after an upload.
+
+    python benchmarks/bench_recruiter.py --resumes 50000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recruiter  # noqa: E402
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "React", "Node.js", "SQL", "MongoDB", "AWS", "Docker",
+    "Kubernetes", "Git", "HTML", "CSS", "TypeScript", "Angular", "Go", "Rust", "Scala",
+    "TensorFlow", "PyTorch", "Machine Learning", "Spark", "Kafka", "Terraform", "GraphQL",
+] + [f"Tool{i}" for i in range(400)]
+DEGREES = ["B.S. Computer Science", "Master of Science", "PhD in Physics", "Diploma", "Bachelor of Arts"]
+
+JOB_DESCRIPTION = """
+Senior Backend Engineer. We need 5+ years of experience building services in
+Python and Go, running on AWS with Docker and Kubernetes. Experience with SQL,
+Kafka and Terraform is a plus. Bachelor's degree in Computer Science required.
+"""
+
+
+def synthetic_resumes(count, seed=7):
+    rng = random.Random(seed)
+    resumes = []
+    for i in range(count):
+        start = rng.randint(1995, 2022)
+        resumes.append({
+            "name": f"Candidate {i}",
+            "email": f"candidate{i}@example.com",
+            "skills": rng.sample(SKILLS, rng.randint(3, 15)),
+            "experience": [{"job_role": "Engineer", "company": "Corp", "duration": f"{start} - Present"}],
+            "education": [{"degree": rng.choice(DEGREES), "institution": "University", "years": ""}],
+        })
+    return resumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--uploads", type=int, default=10, help="resumes appended one at a time to the store")
+    args = parser.parse_args()
+
+    resumes = synthetic_resumes(args.resumes)
+    start = time.perf_counter()
+    matrix = recruiter.FeatureMatrix(resumes)
+    build = time.perf_counter() - start
+
+    timings = []
+    for page in range(1, args.repeat + 1):
+        start = time.perf_counter()
+        result = recruiter.rank_resumes(JOB_DESCRIPTION, matrix, top=args.top, page=page)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    print(f"resumes: {len(matrix)}  vocabulary: {len(matrix.vocabulary)}  "
+          f"matrix: {matrix.skills.nbytes / 1e6:.1f} MB")
+    print(f"feature matrix build (one-off): {build:.2f}s")
+    print(f"rank all resumes: median {timings[len(timings) // 2] * 1000:.1f} ms, "
+          f"max {timings[-1] * 1000:.1f} ms")
+    print(f"required skills detected: {result['requirements']['skills']}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = recruiter.ResumeStore(os.path.join(directory, "parsed_resumes.jsonl"))
+        with open(store.path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(resume) + "\n" for resume in resumes)
+        start = time.perf_counter()
+        store.features()
+        load = time.perf_counter() - start
+
+        upload_timings = []
+        for resume in synthetic_resumes(args.uploads, seed=11):
+            store.add(resume)
+            start = time.perf_counter()
+            recruiter.rank_resumes(JOB_DESCRIPTION, store.features(), top=args.top)
+            upload_timings.append(time.perf_counter() - start)
+        upload_timings.sort()
+
+    print(f"store load (one-off): {load:.2f}s")
+    print(f"rank right after an upload: median {upload_timings[len(upload_timings) // 2] * 1000:.1f} ms, "
+          f"max {upload_timings[-1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
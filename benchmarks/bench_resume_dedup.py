@@ -0,0 +1,191 @@
+"""Near-duplicate resume detection on a synthetic ingestion corpus.
+
+Builds families of resumes: an original plus re-uploads of the same CV with
+a new phone number, email or end date, a reworded bullet, or (not a
+duplicate) a new job added. The corpus is parsed through parse_resume_text
+with a stub LLM backend that sleeps for --latency and echoes the contact
+details, first with deduplication off and then on. Reports LLM calls, the
+dedup ratio, throughput and whether reused results carry the new contact
+details.
+
+    python benchmarks/bench_resume_dedup.py --families 40 --latency 0.05
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import llm_router  # noqa: E402
+import resume_parser  # noqa: E402
+import semantic_cache  # noqa: E402
+
+FIRST_NAMES = ["Alice", "Brian", "Chen", "Dana", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jamal", "Kofi", "Lena"]
+LAST_NAMES = ["Smith", "Okafor", "Garcia", "Novak", "Tanaka", "Moreau", "Singh", "Larsen", "Haddad", "Kowalski"]
+ROLES = ["Software Engineer", "Data Scientist", "Backend Developer", "DevOps Engineer", "Product Manager"]
+COMPANIES = ["TechCorp", "DataWorks", "CloudNine", "Finlytics", "MediSoft", "RetailHub", "GeoMaps"]
+SKILLS = ["Python", "Java", "SQL", "AWS", "Docker", "Kubernetes", "React", "Go", "TensorFlow", "Git"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Automated", "Optimized", "Maintained", "Launched"]
+OBJECTS = ["a billing service", "the data pipeline", "CI/CD workflows", "customer dashboards",
+           "an ML ranking model", "the search API", "monitoring and alerting", "a mobile backend"]
+OUTCOMES = ["cutting latency by {n}%", "saving {n} hours a week", "serving {n}k daily users",
+            "reducing costs by {n}%", "with {n} engineers", "ahead of schedule"]
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w.-]+\.\w+")
+PHONE_RE = re.compile(r"\d{3}-\d{3}-\d{4}")
+
+
+def bullet(rng):
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}, {rng.choice(OUTCOMES).format(n=rng.randint(5, 90))}"
+
+
+def job(rng, start, end):
+    lines = [f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({start} - {end})"]
+    lines += ["- " + bullet(rng) for _ in range(5)]
+    return lines
+
+
+def original(rng, index):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {chr(65 + index % 26)}{index}"
+    start = rng.randint(2008, 2016)
+    return {
+        "name": name,
+        "email": f"{name.split()[0].lower()}{index}@example.com",
+        "phone": f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "summary": " ".join(bullet(rng) + "." for _ in range(3)),
+        "skills": rng.sample(SKILLS, 6),
+        "jobs": [job(rng, start, start + 3), job(rng, start + 3, start + 7), job(rng, start + 7, "Present")],
+        "education": f"B.S. Computer Science, State University ({start - 4} - {start})",
+    }
+
+
+def render(resume):
+    lines = [resume["name"], f"{resume['email']} | {resume['phone']}", "", "Summary", resume["summary"], "",
+             "Skills", ", ".join(resume["skills"]), "", "Experience"]
+    for job_lines in resume["jobs"]:
+        lines += job_lines + [""]
+    lines += ["Education", resume["education"]]
+    return "\n".join(lines)
+
+
+def variant(rng, resume, kind):
+    """A re-upload of resume; returns (resume, whether it should be deduplicated)"""
+    resume = json.loads(json.dumps(resume))
+    if kind == "phone":
+        resume["phone"] = f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+    elif kind == "email":
+        resume["email"] = resume["email"].replace("@example.com", "@mail.example.org")
+    elif kind == "date":
+        resume["jobs"][-1][0] = resume["jobs"][-1][0].replace("Present", str(rng.randint(2023, 2025)))
+    elif kind == "bullet":
+        resume["jobs"][1][2] = "- " + bullet(rng)
+    elif kind == "new_job":
+        resume["jobs"].insert(0, job(rng, 2024, "Present") + ["- " + bullet(rng) for _ in range(4)])
+        resume["skills"] = rng.sample(SKILLS, 8)
+        return resume, False
+    return resume, True
+
+
+def corpus(families, seed):
+    """Shuffled (family, text, is near-duplicate) uploads; each original comes before its re-uploads"""
+    rng = random.Random(seed)
+    originals, documents = {}, []
+    for index in range(families):
+        base = original(rng, index)
+        originals[index] = (index, render(base), False)
+        for kind in rng.choices(["same", "phone", "email", "date", "bullet", "new_job"], k=rng.randint(1, 6)):
+            resume, duplicate = variant(rng, base, kind)
+            documents.append((index, render(resume), duplicate))
+    rng.shuffle(documents)
+    ordered, seen = [], set()
+    for doc in documents:
+        if doc[0] not in seen:
+            seen.add(doc[0])
+            ordered.append(originals[doc[0]])
+        ordered.append(doc)
+    return ordered
+
+
+class EchoModel:
+    """Stub backend that takes --latency and returns the contact details it reads"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        time.sleep(self.latency)
+        text = prompt.split("Resume Text:", 1)[1].strip()
+        return llm_router.TextResponse(json.dumps({
+            "name": text.splitlines()[0].strip(),
+            "email": EMAIL_RE.search(text).group(0),
+            "phone": PHONE_RE.search(text).group(0),
+            "skills": [],
+            "resume_score": 80,
+        }))
+
+
+def run(documents, dedup, latency):
+    config.RESUME_DEDUP_ENABLED = dedup
+    semantic_cache.resume_cache = semantic_cache.SemanticCache(
+        max_entries=config.RESUME_DEDUP_MAX_ENTRIES, ttl=config.RESUME_DEDUP_TTL,
+        threshold=config.RESUME_DEDUP_THRESHOLD, bands=8,
+    )
+    backend = EchoModel(latency)
+    llm_router.router = llm_router.Router(routes={"process_resume": ["stub:echo"]}, clients={"stub:echo": backend})
+
+    reused = correct = false_reuse = missed = 0
+    start = time.perf_counter()
+    for _, text, duplicate in documents:
+        result = resume_parser.parse_resume_text(text)
+        if result.get("deduplicated"):
+            reused += 1
+            false_reuse += not duplicate
+            correct += (result["email"] == EMAIL_RE.search(text).group(0)
+                        and result["phone"] == PHONE_RE.search(text).group(0))
+        elif duplicate:
+            missed += 1
+    elapsed = time.perf_counter() - start
+    return {"calls": backend.calls, "reused": reused, "correct": correct, "false_reuse": false_reuse,
+            "missed": missed, "seconds": elapsed, "per_second": len(documents) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--families", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub LLM latency in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    documents = corpus(args.families, args.seed)
+    duplicates = sum(1 for _, _, duplicate in documents if duplicate)
+
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            baseline = run(documents, False, args.latency)
+            deduped = run(documents, True, args.latency)
+        finally:
+            sys.stdout = stdout
+
+    print(f"{len(documents)} resumes in {args.families} families, {duplicates} near-duplicate re-uploads, "
+          f"threshold {config.RESUME_DEDUP_THRESHOLD}")
+    for name, result in (("dedup off", baseline), ("dedup on", deduped)):
+        print(f"{name:<10} LLM calls {result['calls']:4d}  reused {result['reused']:4d}  "
+              f"{result['seconds']:6.2f} s  {result['per_second']:7.1f} resumes/s")
+    print(f"dedup ratio {deduped['reused'] / len(documents):.1%} of uploads "
+          f"({deduped['reused']}/{duplicates} near-duplicates caught, {deduped['missed']} missed, "
+          f"{deduped['false_reuse']} reused wrongly)")
+    print(f"reused results with the new email and phone: {deduped['correct']}/{deduped['reused']}")
+    print(f"throughput x{deduped['per_second'] / baseline['per_second']:.2f}, "
+          f"LLM calls -{1 - deduped['calls'] / baseline['calls']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""LLM routing and hedging against local stub backends.
+
+Stub backends with different latency, stall and failure profiles serve one
+endpoint. The script reports where the router sent traffic, the latency
+percentiles of a stalling backend with and without hedging, and how traffic
+moves away from the preferred backend when it slows down mid-run.
+
+    python benchmarks/bench_router.py --calls 300
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import llm_router  # noqa: E402
+import llm_stub  # noqa: E402
+
+ENDPOINT = "career_guidance"
+
+
+def backends(seed):
+    return {
+        "stub:fast": llm_stub.StubModel(ENDPOINT, latency=0.03, jitter=0.005, seed=seed),
+        "stub:slow": llm_stub.StubModel(ENDPOINT, latency=0.08, jitter=0.005, seed=seed + 1),
+        "stub:flaky": llm_stub.StubModel(ENDPOINT, latency=0.01, jitter=0.005, failure_rate=0.5, seed=seed + 2),
+        # Fast, but 3% of calls hang for half a second
+        "stub:stalls": llm_stub.StubModel(ENDPOINT, latency=0.03, jitter=0.005, stall_rate=0.03,
+                                          stall_seconds=0.5, seed=seed + 3),
+    }
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(router, calls, concurrency, on_call=None):
+    latencies = []
+    errors = 0
+
+    def one(i):
+        if on_call:
+            on_call(i)
+        start = time.perf_counter()
+        try:
+            router.generate(ENDPOINT, "prompt")
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency in pool.map(one, range(calls)):
+            if latency is None:
+                errors += 1
+            else:
+                latencies.append(latency)
+    return latencies, errors
+
+
+def report(name, router, latencies, errors):
+    served = {key: stats["calls"] for key, stats in router.snapshot()["endpoints"][ENDPOINT].items()}
+    counters = router.snapshot()["counters"]
+    print(f"{name:<20}p50 {percentile(latencies, 50) * 1000:6.1f} ms  p95 {percentile(latencies, 95) * 1000:6.1f} ms  "
+          f"p99 {percentile(latencies, 99) * 1000:6.1f} ms  errors {errors:3d}  hedges {counters['hedges']:3d}  "
+          f"backend calls {served}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    # Enough samples for a p95 quickly
+    config.LLM_HEDGE_MIN_SAMPLES = 10
+    scenarios = [
+        ("routing", ["stub:fast", "stub:slow", "stub:flaky"], False, None),
+        ("stalls, no hedging", ["stub:stalls"], False, None),
+        ("stalls, hedged", ["stub:stalls"], True, None),
+        ("fast backend slows", ["stub:fast", "stub:slow", "stub:flaky"], False, "stub:fast"),
+    ]
+
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            results = []
+            for name, keys, hedge, degraded in scenarios:
+                llm_router.circuit_breaker._breakers.clear()
+                clients = backends(seed=1)
+                router = llm_router.Router(routes={ENDPOINT: keys}, clients=clients, hedge=hedge, explore_rate=0.05)
+
+                def degrade(i, degraded=degraded, clients=clients):
+                    # The preferred backend slows down halfway through
+                    if degraded and i == args.calls // 2:
+                        clients[degraded].latency = 0.2
+                results.append((name, router) + run(router, args.calls, args.concurrency, degrade))
+        finally:
+            sys.stdout = stdout
+
+    for name, router, latencies, errors in results:
+        report(name, router, latencies, errors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Concurrent request capacity of the production server against the stub LLM.
+
+Starts `server.py` with LLM_BACKEND=stub for each worker model, fires a fixed
+number of requests at /api/career_guidance from many client threads and
+reports throughput and latency. Every request asks about a different role so
+none is answered from the semantic cache and each one waits on the stub LLM.
+Run from the repository root:
+
+    python benchmarks/bench_server.py --requests 256 --concurrency 64
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> server environment
+SCENARIOS = {
+    "sync (2 workers x 1)": {"SERVER_WORKER_CLASS": "sync", "SERVER_WORKERS": "2"},
+    "gthread (2 workers x 32)": {"SERVER_WORKER_CLASS": "gthread", "SERVER_WORKERS": "2", "SERVER_THREADS": "32"},
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+def _login(base_url):
+    session = requests.Session()
+    session.post(f"{base_url}/login", data={
+        "email": "admin@careeradvisor.com",
+        "password": "admin123",
+    })
+    return session
+
+
+def run_scenario(name, server_env, total_requests, concurrency, stub_latency):
+    port = _free_port()
+    env = dict(os.environ)
+    env.update(server_env)
+    env.update({
+        "LLM_BACKEND": "stub",
+        "LLM_STUB_LATENCY": str(stub_latency),
+        "SERVER_BIND": f"127.0.0.1:{port}",
+        # Let the stub take all the load so the numbers measure the server
+        "ADMISSION_MAX_INFLIGHT": "1000",
+        "ADMISSION_SHED_THRESHOLD": "1000",
+        "ADMISSION_MAX_QUEUE_WAIT": "60",
+        "ADMISSION_LIMIT_GUIDANCE": "1000",
+    })
+    server = subprocess.Popen([sys.executable, "server.py"], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_for_port(port)
+        base_url = f"http://127.0.0.1:{port}"
+        sessions = [_login(base_url) for _ in range(concurrency)]
+
+        def one(i):
+            # A distinct role per request keeps the semantic cache from answering it
+            payload = {"current_role": f"Software Engineer {i}", "experience_years": "3", "skills": f"Python, Tool{i}"}
+            start = time.perf_counter()
+            response = sessions[i % concurrency].post(f"{base_url}/api/career_guidance", json=payload)
+            return time.perf_counter() - start, response.status_code, response.json().get("degraded", False)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            # Warm up: the first request in each worker imports the feature modules
+            list(pool.map(one, range(total_requests, total_requests + concurrency)))
+            start = time.perf_counter()
+            results = list(pool.map(one, range(total_requests)))
+            elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(r[0] for r in results)
+    return {
+        "scenario": name,
+        "throughput_rps": total_requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": sum(1 for r in results if r[1] != 200),
+        "degraded": sum(1 for r in results if r[2]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--stub-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {args.concurrency} clients, stub LLM latency {args.stub_latency}s")
+    print(f"{'scenario':<28}{'req/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}{'degraded':>10}")
+    for name, server_env in SCENARIOS.items():
+        r = run_scenario(name, server_env, args.requests, args.concurrency, args.stub_latency)
+        print(f"{r['scenario']:<28}{r['throughput_rps']:>8.1f}{r['p50_ms']:>10.0f}"
+              f"{r['p95_ms']:>10.0f}{r['errors']:>8}{r['degraded']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Micro-benchmarks of the parsing and local generation hot paths.
+
+Generates a seeded corpus of resume texts (small, medium, large) and PDFs
+(1, 10 and 50 pages), then times each function with timeit (garbage
+collection off, loop count from autorange, --repeat timed runs) and
+measures one call under tracemalloc for peak memory and the number of
+memory blocks it allocated that are still live when it returns (mostly its
+result; tracemalloc has no count of blocks allocated and freed during the
+call). Results are written as JSON. When a
+baseline exists, any benchmark whose fastest run or peak memory grew by more
+than the threshold is reported and the script exits non-zero. The fastest
+run is compared because it is the least disturbed by other load.
+
+    python benchmarks/bench_suite.py --save-baseline     # record a baseline
+    python benchmarks/bench_suite.py                     # compare against it
+    python benchmarks/bench_suite.py --filter pdf --threshold 0.15
+
+Timings only compare meaningfully on the same machine and Python version.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import career_guidance  # noqa: E402
+import config  # noqa: E402
+import interview_prep  # noqa: E402
+import interview_prep2  # noqa: E402
+import job_matcher  # noqa: E402
+import resume_parser  # noqa: E402
+
+RESULTS_DIR = os.path.join(config.OUTPUT_DIR, "benchmarks")
+SEED = 1234
+
+TEXT_SIZES = {"small": 2 * 1024, "medium": 16 * 1024, "large": 128 * 1024}
+PDF_PAGES = {"1p": 1, "10p": 10, "50p": 50}
+
+ROLES = ["Senior Software Engineer", "Data Analyst", "Backend Developer", "Product Manager", "DevOps Engineer"]
+COMPANIES = ["Acme Corp", "Initech LLC", "Globex Inc", "Umbrella Company", "Hooli"]
+DEGREES = ["Bachelor of Science in Computer Science", "Master of Science in Data Science", "B.A. Economics", "PhD Physics"]
+SCHOOLS = ["State University", "Tech Institute", "City College"]
+SKILLS = ["Python", "Java", "JavaScript", "React", "SQL", "Docker", "Kubernetes", "AWS", "Go", "TensorFlow", "Git"]
+BULLETS = ["Built payment APIs in {skill} serving {n}k requests per day",
+           "Led the migration of {n} services to {skill}",
+           "Cut build times by {n}% with {skill} caching",
+           "Mentored {n} engineers and ran {skill} workshops"]
+
+
+def resume_text(rng, size):
+    """Resume-shaped text of about size characters"""
+    lines = [f"Jordan Lee {rng.randint(1, 999)}", "jordan.lee@example.com | (555) 123-4567", "", "EXPERIENCE"]
+    while sum(len(line) + 1 for line in lines) < size * 0.8:
+        start = rng.randint(2005, 2020)
+        lines.append(f"{rng.choice(ROLES)} | {rng.choice(COMPANIES)} | {start} - {start + rng.randint(1, 4)}")
+        for _ in range(rng.randint(2, 5)):
+            lines.append("• " + rng.choice(BULLETS).format(skill=rng.choice(SKILLS), n=rng.randint(2, 90)))
+    lines += ["", "EDUCATION"]
+    for _ in range(2):
+        year = rng.randint(1995, 2015)
+        lines += [rng.choice(DEGREES), f"{rng.choice(SCHOOLS)}, {year} - {year + 4}"]
+    lines += ["", "SKILLS", ", ".join(rng.sample(SKILLS, 6))]
+    text = "\n".join(lines)
+    return (text * (size // len(text) + 1))[:size]
+
+
+def build_pdf(path, rng, pages):
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_text((36, 36), resume_text(rng, 3000), fontsize=6)
+    doc.save(path)
+    doc.close()
+
+
+def benchmarks(corpus_dir):
+    """(name, function, args) for every benchmark, built from a seeded corpus"""
+    rng = random.Random(SEED)
+    texts = {label: resume_text(rng, size) for label, size in TEXT_SIZES.items()}
+    cases = []
+    for label, pages in PDF_PAGES.items():
+        path = os.path.join(corpus_dir, f"resume_{label}.pdf")
+        build_pdf(path, rng, pages)
+        cases.append((f"extract_text_from_pdf[{label}]", resume_parser.extract_text_from_pdf, (path,)))
+    for label, text in texts.items():
+        cases.append((f"parse_resume_basic[{label}]", resume_parser.parse_resume_basic, (text,)))
+    for label, text in texts.items():
+        cases.append((f"extract_skills[{label}]", resume_parser.extract_skills, (text,)))
+        cases.append((f"extract_education[{label}]", resume_parser.extract_education, (text,)))
+        cases.append((f"extract_experience[{label}]", resume_parser.extract_experience, (text,)))
+    medium = texts["medium"]
+    cases += [
+        ("calculate_resume_score", resume_parser.calculate_resume_score,
+         (resume_parser.extract_skills(medium), resume_parser.extract_education(medium),
+          resume_parser.extract_experience(medium))),
+        ("generate_mock_jobs", job_matcher.generate_mock_jobs, ("Software Engineer", "Berlin", "Python, SQL, AWS")),
+        ("generate_mock_guidance", career_guidance.generate_mock_guidance,
+         ("Data Analyst", "3", "SQL, Python, Tableau", "machine learning")),
+        ("generate_mock_questions", interview_prep.generate_mock_questions, ("Backend Developer", "senior")),
+        ("generate_mock_response", interview_prep2.generate_mock_response,
+         ("Can you give me some technical questions about system design?", "Software Engineer")),
+    ]
+    return cases
+
+
+def run_one(fn, args, repeat):
+    call = lambda: fn(*args)  # noqa: E731
+    random.seed(SEED)
+    timer = timeit.Timer(call)
+    loops, _ = timer.autorange()
+    times = [total / loops for total in timer.repeat(repeat=repeat, number=loops)]
+
+    # Memory of a single call, measured outside the timed runs
+    gc.collect()
+    random.seed(SEED)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = call()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+    # Only blocks allocated by the call, not the snapshot held in this frame
+    own = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    changes = after.filter_traces(own).compare_to(before.filter_traces(own), "traceback")
+    live_blocks = sum(stat.count_diff for stat in changes)
+
+    quartiles = statistics.quantiles(times, n=4) if len(times) > 1 else [times[0]] * 3
+    return {
+        "median_us": round(statistics.median(times) * 1e6, 3),
+        "min_us": round(min(times) * 1e6, 3),
+        "iqr_us": round((quartiles[2] - quartiles[0]) * 1e6, 3),
+        "loops": loops,
+        "repeat": repeat,
+        "peak_kb": round(peak / 1024, 1),
+        "live_blocks": live_blocks,
+    }
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    """Benchmarks slower or hungrier than the baseline by more than the thresholds"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        time_change = result["min_us"] / before["min_us"] - 1 if before["min_us"] else 0.0
+        # 1 KB of slack so tiny peaks do not flag on noise
+        memory_change = (result["peak_kb"] + 1) / (before["peak_kb"] + 1) - 1
+        result["time_change"] = round(time_change, 3)
+        result["memory_change"] = round(memory_change, 3)
+        if time_change > threshold:
+            regressions.append(f"{name}: fastest run {before['min_us']:.1f} -> {result['min_us']:.1f} us "
+                               f"({time_change:+.0%})")
+        if memory_change > memory_threshold:
+            regressions.append(f"{name}: peak {before['peak_kb']:.1f} -> {result['peak_kb']:.1f} KB "
+                               f"({memory_change:+.0%})")
+    return regressions
+
+
+def load_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="timed runs per benchmark")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="also store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed growth of the fastest run (0.25 = 25%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="allowed peak memory growth")
+    args = parser.parse_args()
+
+    baseline = None if args.save_baseline else load_json(args.baseline)
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.node(),
+        "seed": SEED,
+    }
+    if baseline and (baseline["meta"]["python"], baseline["meta"]["machine"]) != (meta["python"], meta["machine"]):
+        print("[WARNING] Baseline was recorded with another Python version or machine; timings may not compare")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        cases = [case for case in benchmarks(corpus_dir) if args.filter in case[0]]
+        print(f"{'benchmark':<34}{'median us':>12}{'min us':>12}{'peak KB':>10}{'live blocks':>13}{'vs baseline':>13}")
+        for name, fn, fn_args in cases:
+            # The mock generators log as they go
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                result = run_one(fn, fn_args, args.repeat)
+            results[name] = result
+            change = ""
+            if baseline and name in baseline["results"] and baseline["results"][name]["min_us"]:
+                change = f"{result['min_us'] / baseline['results'][name]['min_us'] - 1:+.0%}"
+            print(f"{name:<34}{result['median_us']:>12.1f}{result['min_us']:>12.1f}"
+                  f"{result['peak_kb']:>10.1f}{result['live_blocks']:>13d}{change:>13}")
+
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold) if baseline else []
+    report = {"meta": meta, "results": results, "regressions": regressions}
+    save_json(args.output, report)
+    print(f"\nresults written to {args.output}")
+    if args.save_baseline:
+        save_json(args.baseline, report)
+        print(f"baseline saved to {args.baseline}")
+    elif baseline is None:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over the thresholds:")
+        for line in regressions:
+            print("  " + line)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
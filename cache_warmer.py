@@ -0,0 +1,203 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+import admission
+import config
+import semantic_cache
+import usage
+
+# Popularity-driven cache warming. LLM-backed requests are appended to a JSONL
+# request log. A background thread mines the log for each feature's most
+# requested combinations (grouped by their canonical cache key, so "SWE" and
+# "Software Engineer" count together) and recomputes those missing from the
+# semantic cache or due to expire before the next run. Warming makes one LLM
+# call at a time, spaced by CACHE_WARMER_MIN_INTERVAL, and only while live
+# traffic leaves the LLM idle; its tokens are charged to the "cache-warmer" user.
+
+# feature -> (request parameters, cache key function)
+FEATURES = {
+    "career_guidance": (("current_role", "experience_years", "skills", "interests"), semantic_cache.guidance_key),
+    "interview_questions": (("job_role", "experience_level"), semantic_cache.questions_key),
+    "find_jobs": (("job_position", "location", "skills"), semantic_cache.jobs_key),
+}
+
+WARMER_USER = "cache-warmer"
+
+_log_lock = threading.Lock()
+
+
+def log_request(feature, **params):
+    """Append an LLM-backed request to the log the warmer mines"""
+    if not config.CACHE_WARMER_LOG_ENABLED or feature not in FEATURES:
+        return
+    names = FEATURES[feature][0]
+    line = json.dumps({"t": int(time.time()), "feature": feature,
+                       "params": {name: str(params.get(name) or "") for name in names}})
+    path = config.CACHE_WARMER_LOG_PATH
+    with _log_lock:
+        try:
+            if os.path.exists(path) and os.path.getsize(path) > config.CACHE_WARMER_LOG_MAX_BYTES:
+                # Keep one rotated file so the mining window survives a rotation
+                os.replace(path, path + ".1")
+            with open(path, "a", encoding="utf-8") as log_file:
+                log_file.write(line + "\n")
+        except OSError as e:
+            print(f"[ERROR] Could not write request log: {str(e)}")
+
+
+def top_requests(limit=None, days=None, min_count=None):
+    """Most requested parameter combinations per feature, most popular first"""
+    limit = config.CACHE_WARMER_TOP_N if limit is None else limit
+    days = config.CACHE_WARMER_WINDOW_DAYS if days is None else days
+    min_count = config.CACHE_WARMER_MIN_COUNT if min_count is None else min_count
+    cutoff = time.time() - days * 86400
+    counts = Counter()
+    latest = {}
+    path = config.CACHE_WARMER_LOG_PATH
+    for log_path in (path + ".1", path):
+        try:
+            with open(log_path, encoding="utf-8") as log_file:
+                for line in log_file:
+                    try:
+                        record = json.loads(line)
+                        feature, params = record["feature"], record["params"]
+                        if record["t"] < cutoff or feature not in FEATURES:
+                            continue
+                        entry = (feature, FEATURES[feature][1](**params).exact)
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    counts[entry] += 1
+                    latest[entry] = params
+        except FileNotFoundError:
+            continue
+
+    top = {feature: [] for feature in FEATURES}
+    for (feature, exact), count in counts.most_common():
+        if count >= min_count and len(top[feature]) < limit:
+            top[feature].append({"params": latest[(feature, exact)], "count": count})
+    return top
+
+
+def _compute(feature, params):
+    """Run the feature's LLM path, which stores a successful result in the cache"""
+    if feature == "career_guidance":
+        import career_guidance
+        if career_guidance.GENAI_AVAILABLE:
+            career_guidance.get_guidance_with_ai(**params)
+            return True
+    elif feature == "interview_questions":
+        import interview_prep
+        if interview_prep.GENAI_AVAILABLE:
+            interview_prep.get_questions_with_ai(**params)
+            return True
+    elif feature == "find_jobs":
+        import job_matcher
+        if job_matcher.GENAI_AVAILABLE:
+            job_matcher.find_jobs_with_ai(**params)
+            return True
+    return False
+
+
+class CacheWarmer:
+    """Background thread that keeps popular requests in the semantic cache"""
+
+    def __init__(self, interval=None, min_interval=None, max_live_inflight=None):
+        self.interval = config.CACHE_WARMER_INTERVAL if interval is None else interval
+        self.min_interval = config.CACHE_WARMER_MIN_INTERVAL if min_interval is None else min_interval
+        self.max_live_inflight = config.CACHE_WARMER_MAX_LIVE_INFLIGHT if max_live_inflight is None else max_live_inflight
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._stats = Counter()
+        self.last_run = None
+
+    def start(self):
+        """Start the warming thread once per process"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="cache-warmer", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def trigger(self):
+        """Run a warming pass now instead of at the next interval"""
+        self._wake.set()
+
+    def _loop(self):
+        self._wake.wait(config.CACHE_WARMER_INITIAL_DELAY)
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[ERROR] Cache warming failed: {str(e)}")
+            self._wake.wait(self.interval)
+
+    def _live_traffic_idle(self):
+        load = admission.controller.snapshot()
+        return load["inflight"] + load["waiting"] <= self.max_live_inflight
+
+    def _wait_for_idle(self):
+        """Wait until live traffic is idle; False if it stays busy too long or we are stopping"""
+        waited = 0.0
+        while not self._live_traffic_idle():
+            if waited >= config.CACHE_WARMER_MAX_BUSY_WAIT or self._stop.wait(1.0):
+                return False
+            waited += 1.0
+        return not self._stop.is_set()
+
+    def run_once(self):
+        """Warm the current top requests; returns how many were recomputed"""
+        usage.set_user(WARMER_USER)
+        warmed = 0
+        for feature, entries in top_requests().items():
+            key_fn = FEATURES[feature][1]
+            for entry in entries:
+                key = key_fn(**entry["params"])
+                remaining = semantic_cache.cache.expires_in(feature, key)
+                if remaining is not None and remaining > self.interval:
+                    self._count("fresh")
+                    continue
+                if not self._wait_for_idle():
+                    # Live traffic keeps the LLM busy: leave the rest for the next run
+                    self._count("skipped_busy")
+                    self.last_run = time.time()
+                    return warmed
+                if not _compute(feature, entry["params"]):
+                    self._count("unavailable")
+                    continue
+                if semantic_cache.cache.expires_in(feature, key):
+                    warmed += 1
+                    self._count("warmed")
+                else:
+                    self._count("failed")
+                if self._stop.wait(self.min_interval):
+                    break
+        self.last_run = time.time()
+        return warmed
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._stats)
+        return {
+            "enabled": config.CACHE_WARMER_ENABLED,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval": self.interval,
+            "last_run": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.last_run)) if self.last_run else None,
+            "counters": counters,
+            "top_requests": top_requests(),
+        }
+
+
+warmer = CacheWarmer()
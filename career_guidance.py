@@ -1,5 +1,11 @@
 import json
 import random
+import batching
+import llm_client
+import profiling
+import semantic_cache
+
+MODEL_NAME = "gemini-2.0-flash"
 
 # Try to import Google Generative AI package
 GENAI_AVAILABLE = False
@@ -11,51 +17,101 @@ try:
     # Configure Gemini API if available
     if hasattr(config, 'GEMINI_API_KEY'):
         genai.configure(api_key=config.GEMINI_API_KEY)
-        model = genai.GenerativeModel(model_name="gemini-2.0-flash")
+        model = genai.GenerativeModel(model_name=MODEL_NAME)
 except ImportError:
     print("[WARNING] Google Generative AI package not available. Using fallback mode.")
 
-def get_career_guidance(current_role="", experience_years="", skills="", interests=""):
+def get_career_guidance(current_role="", experience_years="", skills="", interests="", use_ai=True, deadline=None):
     """Get career guidance based on user input"""
     try:
-        if GENAI_AVAILABLE and (current_role or skills):
-            return get_guidance_with_ai(current_role, experience_years, skills, interests)
+        cached = semantic_cache.cache.get('career_guidance', semantic_cache.guidance_key(current_role, experience_years, skills, interests))
+        if cached is not None:
+            return cached
+        if GENAI_AVAILABLE and use_ai and (current_role or skills) and (deadline is None or deadline.allows_llm()):
+            return get_guidance_with_ai(current_role, experience_years, skills, interests, deadline)
         else:
             return generate_mock_guidance(current_role, experience_years, skills, interests)
     except Exception as e:
         print(f"[ERROR] Error getting career guidance: {str(e)}")
         return generate_mock_guidance(current_role, experience_years, skills, interests)
 
-def get_guidance_with_ai(current_role, experience_years, skills, interests):
+def get_guidance_with_ai(current_role, experience_years, skills, interests, deadline=None):
     """Get career guidance using AI"""
     try:
-        prompt = f"""
-        Provide career guidance for someone with:
-        Current Role: {current_role}
-        Experience: {experience_years} years
-        Skills: {skills}
-        Interests: {interests}
-        
-        Return a JSON object with the following structure:
-        {{
-            "skill_gap_analysis": ["Skill 1", "Skill 2", "Skill 3"],
-            "skill_development_plan": ["Plan 1", "Plan 2", "Plan 3"],
-            "certifications_courses": ["Course 1", "Course 2", "Course 3"],
-            "project_ideas": ["Project 1", "Project 2", "Project 3"],
-            "estimated_timeline": {{"total_estimated_time": "6-12 months"}},
-            "job_readiness_indicator": "Ready/Needs improvement"
-        }}
-        
-        Make the guidance specific to the role and skills mentioned.
-        """
-        
-        response = model.generate_content(prompt)
-        result = json.loads(response.text)
-        return result
+        return ask_guidance(current_role, experience_years, skills, interests, deadline)
     except Exception as e:
         print(f"[ERROR] AI career guidance failed: {str(e)}")
         return generate_mock_guidance(current_role, experience_years, skills, interests)
 
+def ask_guidance(current_role, experience_years, skills, interests, deadline=None):
+    """Ask the model for career guidance and cache it; raises if the call fails"""
+    with profiling.span('prompt'):
+        prompt = f"""
+    Provide career guidance for someone with:
+    Current Role: {current_role}
+    Experience: {experience_years} years
+    Skills: {skills}
+    Interests: {interests}
+    
+    Return a JSON object with the following structure:
+    {{
+        "skill_gap_analysis": ["Skill 1", "Skill 2", "Skill 3"],
+        "skill_development_plan": ["Plan 1", "Plan 2", "Plan 3"],
+        "certifications_courses": ["Course 1", "Course 2", "Course 3"],
+        "project_ideas": ["Project 1", "Project 2", "Project 3"],
+        "estimated_timeline": {{"total_estimated_time": "6-12 months"}},
+        "job_readiness_indicator": "Ready/Needs improvement"
+    }}
+    
+    Make the guidance specific to the role and skills mentioned.
+    """
+    
+    response = llm_client.generate(model, prompt, MODEL_NAME, 'career_guidance', deadline)
+    result = json.loads(response.text)
+    semantic_cache.cache.put('career_guidance', semantic_cache.guidance_key(current_role, experience_years, skills, interests), result)
+    return result
+
+GUIDANCE_SCHEMA = """{
+        "skill_gap_analysis": ["Skill 1", "Skill 2", "Skill 3"],
+        "skill_development_plan": ["Plan 1", "Plan 2", "Plan 3"],
+        "certifications_courses": ["Course 1", "Course 2", "Course 3"],
+        "project_ideas": ["Project 1", "Project 2", "Project 3"],
+        "estimated_timeline": {"total_estimated_time": "6-12 months"},
+        "job_readiness_indicator": "Ready/Needs improvement"
+    }"""
+
+def get_career_guidance_batch(queries, use_ai=True, deadline=None):
+    """Get career guidance for many queries, packing small ones into shared LLM prompts"""
+    return batching.run_batch(
+        queries, ('current_role', 'experience_years', 'skills', 'interests'),
+        lambda chunk: get_guidance_with_ai_packed(chunk, deadline), generate_mock_guidance,
+        use_ai=GENAI_AVAILABLE and use_ai, needs_ai=lambda key: key[0] or key[2], route='guidance',
+        feature='career_guidance', cache_key=semantic_cache.guidance_key,
+    )
+
+def get_guidance_with_ai_packed(queries, deadline=None):
+    """Answer several (current_role, experience_years, skills, interests) queries with one LLM call"""
+    if deadline is not None and not deadline.allows_llm():
+        return [None] * len(queries)
+    try:
+        if len(queries) == 1:
+            results = [ask_guidance(*queries[0], deadline)]
+            return [r if isinstance(r, dict) and r.get("skill_gap_analysis") else None for r in results]
+        prompt = batching.build_packed_prompt(
+            "Provide career guidance for each of the following people. Make each answer specific to their role and skills.",
+            [
+                f"Current Role: {role}; Experience: {years} years; Skills: {skills}; Interests: {interests}"
+                for role, years, skills, interests in queries
+            ],
+            GUIDANCE_SCHEMA,
+        )
+        response = llm_client.generate(model, prompt, MODEL_NAME, 'career_guidance', deadline)
+        results = batching.split_packed_response(response.text, len(queries))
+        return [r if isinstance(r, dict) and r.get("skill_gap_analysis") else None for r in results]
+    except Exception as e:
+        print(f"[ERROR] AI batch career guidance failed: {str(e)}")
+        return [None] * len(queries)
+
 def generate_mock_guidance(current_role, experience_years, skills, interests):
     """Generate mock career guidance when AI is not available"""
     
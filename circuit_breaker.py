@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import deque
+
+import config
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited by an open breaker"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"Circuit open for {name}, retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Failure-rate and latency based circuit breaker with half-open probing"""
+
+    def __init__(self, name, window_size=20, min_calls=5, failure_rate_threshold=0.5,
+                 slow_call_seconds=10.0, slow_call_rate_threshold=0.8, open_seconds=30.0,
+                 half_open_probes=1):
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._outcomes = deque(maxlen=window_size)  # (failed, slow) pairs
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._listeners = []
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def add_listener(self, listener):
+        """Register listener(breaker, old_state, new_state) for state changes"""
+        self._listeners.append(listener)
+
+    def _transition(self, new_state):
+        # Caller holds self._lock; listeners are notified after it is released
+        old_state = self._state
+        self._state = new_state
+        if new_state == OPEN:
+            self._opened_at = time.monotonic()
+        if new_state in (CLOSED, OPEN):
+            self._outcomes.clear()
+        self._probes_in_flight = 0
+        return old_state, new_state
+
+    def _notify(self, change):
+        if change is None:
+            return
+        old_state, new_state = change
+        for listener in list(self._listeners):
+            try:
+                listener(self, old_state, new_state)
+            except Exception as e:
+                print(f"[ERROR] Circuit breaker listener failed: {str(e)}")
+
+    def _maybe_half_open(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            return self._transition(HALF_OPEN)
+        return None
+
+    def allow_request(self):
+        """Return True if a call may proceed; reserves a probe slot when half-open"""
+        with self._lock:
+            change = self._maybe_half_open()
+            if self._state == CLOSED:
+                allowed = True
+            elif self._state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                allowed = True
+            else:
+                allowed = False
+        self._notify(change)
+        return allowed
+
+    def retry_in(self):
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def record(self, failed, latency):
+        """Record the outcome of a call that was allowed through"""
+        slow = latency >= self.slow_call_seconds
+        change = None
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                change = self._transition(OPEN if failed or slow else CLOSED)
+            elif self._state == CLOSED:
+                self._outcomes.append((failed, slow))
+                calls = len(self._outcomes)
+                if calls >= self.min_calls:
+                    failure_rate = sum(1 for f, _ in self._outcomes if f) / calls
+                    slow_rate = sum(1 for _, s in self._outcomes if s) / calls
+                    if (failure_rate >= self.failure_rate_threshold
+                            or slow_rate >= self.slow_call_rate_threshold):
+                        change = self._transition(OPEN)
+        self._notify(change)
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn through the breaker, raising CircuitOpenError when short-circuited"""
+        if not self.allow_request():
+            raise CircuitOpenError(self.name, self.retry_in())
+        start = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record(True, time.monotonic() - start)
+            raise
+        self.record(False, time.monotonic() - start)
+        return result
+
+    def snapshot(self):
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                "state": self._state,
+                "calls_in_window": calls,
+                "failure_rate": round(sum(1 for f, _ in self._outcomes if f) / calls, 3) if calls else 0.0,
+                "slow_rate": round(sum(1 for _, s in self._outcomes if s) / calls, 3) if calls else 0.0,
+            }
+
+
+_breakers = {}
+_registry_lock = threading.Lock()
+_events = deque(maxlen=100)
+
+
+def _log_transition(breaker, old_state, new_state):
+    _events.append({
+        "breaker": breaker.name,
+        "from": old_state,
+        "to": new_state,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    print(f"[WARNING] Circuit breaker {breaker.name}: {old_state} -> {new_state}")
+
+
+def get_breaker(model_name, endpoint):
+    """Return the shared breaker for a model and endpoint, creating it on first use"""
+    name = f"{model_name}:{endpoint}"
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                window_size=config.CIRCUIT_BREAKER_WINDOW,
+                min_calls=config.CIRCUIT_BREAKER_MIN_CALLS,
+                failure_rate_threshold=config.CIRCUIT_BREAKER_FAILURE_RATE,
+                slow_call_seconds=config.CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+                slow_call_rate_threshold=config.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+                open_seconds=config.CIRCUIT_BREAKER_OPEN_SECONDS,
+            )
+            breaker.add_listener(_log_transition)
+            _breakers[name] = breaker
+        return breaker
+
+
+def snapshot():
+    """Return breaker states and recent state changes for monitoring"""
+    with _registry_lock:
+        breakers = dict(_breakers)
+    return {
+        "breakers": {name: breaker.snapshot() for name, breaker in breakers.items()},
+        "events": list(_events),
+    }
@@ -35,3 +35,192 @@ SAMPLE_RESUME_PATH = os.path.join(RESUME_SAMPLES_DIR, "Sample_resume.pdf")
 # Model configurations
 RESUME_PARSER_MODEL = "gemini-2.0-flash"
 JOB_MATCHER_MODEL = "gemini-2.5-pro-preview-03-25"
+
+# Admission control for LLM-backed routes
+# Above ADMISSION_MAX_INFLIGHT concurrent LLM calls (or when queue waits exceed
+# ADMISSION_MAX_QUEUE_WAIT seconds) requests are served by the local fallbacks.
+# Above ADMISSION_SHED_THRESHOLD in-flight plus queued calls API callers get a 429.
+ADMISSION_MAX_INFLIGHT = int(os.environ.get('ADMISSION_MAX_INFLIGHT', 16))
+ADMISSION_SHED_THRESHOLD = int(os.environ.get('ADMISSION_SHED_THRESHOLD', 32))
+ADMISSION_MAX_QUEUE_WAIT = float(os.environ.get('ADMISSION_MAX_QUEUE_WAIT', 2.0))
+# Seconds for the average queue wait to halve when no request is queueing
+ADMISSION_QUEUE_WAIT_HALF_LIFE = float(os.environ.get('ADMISSION_QUEUE_WAIT_HALF_LIFE', 5.0))
+ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', 5))
+ADMISSION_DEFAULT_ROUTE_LIMIT = 4
+ADMISSION_ROUTE_LIMITS = {
+    'resume': int(os.environ.get('ADMISSION_LIMIT_RESUME', 4)),
+    'jobs': int(os.environ.get('ADMISSION_LIMIT_JOBS', 6)),
+    'guidance': int(os.environ.get('ADMISSION_LIMIT_GUIDANCE', 6)),
+    'interview_questions': int(os.environ.get('ADMISSION_LIMIT_INTERVIEW_QUESTIONS', 6)),
+    'interview_chat': int(os.environ.get('ADMISSION_LIMIT_INTERVIEW_CHAT', 8)),
+}
+
+# Circuit breaker around LLM calls (one breaker per model and endpoint)
+CIRCUIT_BREAKER_WINDOW = int(os.environ.get('CIRCUIT_BREAKER_WINDOW', 20))
+CIRCUIT_BREAKER_MIN_CALLS = int(os.environ.get('CIRCUIT_BREAKER_MIN_CALLS', 5))
+CIRCUIT_BREAKER_FAILURE_RATE = float(os.environ.get('CIRCUIT_BREAKER_FAILURE_RATE', 0.5))
+CIRCUIT_BREAKER_SLOW_CALL_SECONDS = float(os.environ.get('CIRCUIT_BREAKER_SLOW_CALL_SECONDS', 10.0))
+CIRCUIT_BREAKER_SLOW_CALL_RATE = float(os.environ.get('CIRCUIT_BREAKER_SLOW_CALL_RATE', 0.8))
+CIRCUIT_BREAKER_OPEN_SECONDS = float(os.environ.get('CIRCUIT_BREAKER_OPEN_SECONDS', 30.0))
+
+# Per-request deadlines (seconds). Every stage of a request shares one budget;
+# DEADLINE_RENDER_RESERVE is held back so a fallback can always be rendered.
+REQUEST_DEADLINE_SECONDS = float(os.environ.get('REQUEST_DEADLINE_SECONDS', 20.0))
+REQUEST_DEADLINES = {
+    'resume': 30.0,
+    'jobs': 20.0,
+    'guidance': 20.0,
+    'interview_questions': 20.0,
+    'interview_chat': 15.0,
+    'jobs_batch': 45.0,
+    'guidance_batch': 45.0,
+}
+DEADLINE_RENDER_RESERVE = float(os.environ.get('DEADLINE_RENDER_RESERVE', 0.5))
+DEADLINE_MIN_LLM_SECONDS = float(os.environ.get('DEADLINE_MIN_LLM_SECONDS', 1.0))
+LLM_MAX_WORKERS = int(os.environ.get('LLM_MAX_WORKERS', 32))
+
+# LLM backend: "gemini" for the real API, "stub" for the offline stub used in benchmarks
+LLM_BACKEND = os.environ.get('LLM_BACKEND', 'gemini')
+LLM_STUB_LATENCY = float(os.environ.get('LLM_STUB_LATENCY', 0.5))
+
+# Production server (python server.py). LLM-bound routes spend most of their time
+# waiting on the network, so each worker runs many threads; PDF extraction is CPU
+# bound and runs in a separate process pool when PDF_EXTRACTION_PROCESSES > 0.
+SERVER_BIND = os.environ.get('SERVER_BIND', '0.0.0.0:' + os.environ.get('PORT', '5000'))
+SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', 2))
+SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 32))
+SERVER_WORKER_CLASS = os.environ.get('SERVER_WORKER_CLASS', 'gthread')
+SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT', 60))
+PDF_EXTRACTION_PROCESSES = int(os.environ.get('PDF_EXTRACTION_PROCESSES', 0))
+
+# Batch API endpoints: identical queries are answered once and up to
+# BATCH_PACK_SIZE small queries share one LLM prompt
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 50))
+BATCH_PACK_SIZE = int(os.environ.get('BATCH_PACK_SIZE', 4))
+BATCH_PACK_MAX_CHARS = int(os.environ.get('BATCH_PACK_MAX_CHARS', 1200))
+BATCH_MAX_PARALLEL_CALLS = int(os.environ.get('BATCH_MAX_PARALLEL_CALLS', 3))
+
+# Semantic result cache for career guidance and interview questions. Requests are
+# canonicalized (role aliases, sorted skill sets, experience buckets) before the
+# exact lookup; near-duplicates above the MinHash threshold are served as a second tier.
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.environ.get('SEMANTIC_CACHE_MAX_ENTRIES', 2000))
+SEMANTIC_CACHE_TTL = int(os.environ.get('SEMANTIC_CACHE_TTL', 24 * 3600))
+SEMANTIC_CACHE_NEAR_THRESHOLD = float(os.environ.get('SEMANTIC_CACHE_NEAR_THRESHOLD', 0.8))
+
+# Near-duplicate resumes. AI-parsed resumes are fingerprinted with MinHash over
+# word shingles; a resume at least RESUME_DEDUP_THRESHOLD similar to an earlier
+# one (the same CV with a new date or phone number) reuses its parsed result
+# with the contact details taken from the new text.
+RESUME_DEDUP_ENABLED = os.environ.get('RESUME_DEDUP_ENABLED', '1').lower() in ('1', 'true', 'yes')
+RESUME_DEDUP_THRESHOLD = float(os.environ.get('RESUME_DEDUP_THRESHOLD', 0.9))
+RESUME_DEDUP_SHINGLE_WORDS = int(os.environ.get('RESUME_DEDUP_SHINGLE_WORDS', 3))
+RESUME_DEDUP_MAX_ENTRIES = int(os.environ.get('RESUME_DEDUP_MAX_ENTRIES', 5000))
+RESUME_DEDUP_TTL = int(os.environ.get('RESUME_DEDUP_TTL', 7 * 24 * 3600))
+
+# Store of parsed resumes used by the recruiter ranking (not available on Vercel)
+RESUME_STORE_PATH = os.path.join(OUTPUT_DIR, 'parsed_resumes.jsonl')
+RESUME_STORE_ENABLED = not os.environ.get('VERCEL')
+
+# Resume text extraction budgets. Pages are read one at a time and extraction
+# stops once PDF_MAX_CHARS or PDF_MAX_PAGES is reached, so a huge upload cannot
+# hold more than PDF_MAX_CHARS of text per request (uploads keep all extracted
+# pages in a list). The LLM prompt gets at most RESUME_PROMPT_MAX_CHARS of it.
+PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', 200000))
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 50))
+PDF_TEXT_CHUNK_CHARS = int(os.environ.get('PDF_TEXT_CHUNK_CHARS', 64 * 1024))
+RESUME_PROMPT_MAX_CHARS = int(os.environ.get('RESUME_PROMPT_MAX_CHARS', 30000))
+
+# Opt-in request profiling. A request is profiled when it sends PROFILING_HEADER
+# with the value of PROFILING_TOKEN (the header is ignored while no token is
+# set), when profiling is switched on at /api/admin/profiling, or at random
+# with PROFILING_SAMPLE_RATE. Collapsed stacks and spans are written to
+# PROFILING_OUTPUT_DIR, which keeps the PROFILING_MAX_FILES most recent profiles.
+PROFILING_HEADER = 'X-Profile'
+PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0.0))
+PROFILING_INTERVAL = float(os.environ.get('PROFILING_INTERVAL', 0.005))
+PROFILING_MAX_CONCURRENT = int(os.environ.get('PROFILING_MAX_CONCURRENT', 2))
+PROFILING_OUTPUT_DIR = os.path.join(OUTPUT_DIR, 'profiles')
+PROFILING_MAX_FILES = int(os.environ.get('PROFILING_MAX_FILES', 100))
+
+# Interview chatbot fast path: routine messages (greetings, thanks, help, requests
+# for a kind of practice) classified with at least this confidence are answered
+# locally instead of by the LLM
+INTENT_LOCAL_THRESHOLD = float(os.environ.get('INTENT_LOCAL_THRESHOLD', 0.75))
+INTENT_MAX_LOCAL_WORDS = int(os.environ.get('INTENT_MAX_LOCAL_WORDS', 12))
+
+# LLM routing. Each endpoint lists its candidate backends as "provider:model".
+# A call goes to the candidate with the lowest expected latency (moving average
+# latency inflated by the moving average error rate) whose breaker is not open.
+# With LLM_HEDGE_ENABLED, a call that runs past the backend's p95 latency gets a
+# second request on the runner-up and the first answer wins.
+OPENAI_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-4o-mini')
+OPENAI_API_URL = os.environ.get('OPENAI_API_URL', 'https://api.openai.com/v1/chat/completions')
+LLM_DEFAULT_BACKENDS = ['gemini:gemini-2.0-flash', 'openai:' + OPENAI_MODEL]
+LLM_ROUTES = {
+    'process_resume': ['gemini:' + RESUME_PARSER_MODEL] + LLM_DEFAULT_BACKENDS,
+    'find_jobs': ['gemini:' + JOB_MATCHER_MODEL] + LLM_DEFAULT_BACKENDS,
+}
+for _endpoint in ('process_resume', 'find_jobs', 'career_guidance', 'interview_questions', 'interview_chat'):
+    if os.environ.get('LLM_ROUTE_' + _endpoint.upper()):
+        LLM_ROUTES[_endpoint] = os.environ['LLM_ROUTE_' + _endpoint.upper()].split(',')
+LLM_ROUTER_EWMA_ALPHA = float(os.environ.get('LLM_ROUTER_EWMA_ALPHA', 0.2))
+LLM_ROUTER_EXPLORE_RATE = float(os.environ.get('LLM_ROUTER_EXPLORE_RATE', 0.05))
+LLM_ROUTER_MAX_ATTEMPTS = int(os.environ.get('LLM_ROUTER_MAX_ATTEMPTS', 2))
+LLM_HEDGE_ENABLED = os.environ.get('LLM_HEDGE_ENABLED', '').lower() in ('1', 'true', 'yes')
+LLM_HEDGE_PERCENTILE = float(os.environ.get('LLM_HEDGE_PERCENTILE', 95))
+LLM_HEDGE_MIN_SAMPLES = int(os.environ.get('LLM_HEDGE_MIN_SAMPLES', 20))
+# Stub mode latency per backend, e.g. "gemini:gemini-2.0-flash=0.3,openai:gpt-4o-mini=0.8"
+LLM_STUB_LATENCIES = dict(
+    (key.strip(), float(value)) for key, value in
+    (pair.rsplit('=', 1) for pair in os.environ.get('LLM_STUB_LATENCIES', '').split(',') if '=' in pair)
+)
+
+# HTTP response compression (gzip, or brotli when the brotli package is
+# installed) and caching of near-static pages
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', '1').lower() in ('1', 'true', 'yes')
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', 500))
+COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+COMPRESSION_CACHE_SIZE = int(os.environ.get('COMPRESSION_CACHE_SIZE', 64))
+PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', '1').lower() in ('1', 'true', 'yes')
+
+# LLM token accounting. Usage per user, route and model is summed per day in a
+# SQLite file (in memory on Vercel). A user past their daily token budget is
+# served cached or local results; a budget of 0 means unlimited. Per-user
+# budgets override the default, e.g. USAGE_USER_BUDGETS="1=500000,2=100000".
+USAGE_DB_PATH = os.environ.get('USAGE_DB_PATH', ':memory:' if os.environ.get('VERCEL') else os.path.join(OUTPUT_DIR, 'usage.sqlite3'))
+USAGE_FLUSH_SECONDS = float(os.environ.get('USAGE_FLUSH_SECONDS', 5.0))
+USAGE_CHARS_PER_TOKEN = float(os.environ.get('USAGE_CHARS_PER_TOKEN', 4.0))
+USAGE_DAILY_TOKEN_BUDGET = int(os.environ.get('USAGE_DAILY_TOKEN_BUDGET', 0))
+USAGE_USER_BUDGETS = dict(
+    (user.strip(), int(tokens)) for user, tokens in
+    (pair.rsplit('=', 1) for pair in os.environ.get('USAGE_USER_BUDGETS', '').split(',') if '=' in pair)
+)
+# USD per million (prompt, response) tokens, for cost estimates
+USAGE_PRICES = {
+    'gemini-2.0-flash': (0.10, 0.40),
+    'gemini-2.5-pro-preview-03-25': (1.25, 10.00),
+    'gpt-4o-mini': (0.15, 0.60),
+}
+
+# Cache warming. With CACHE_WARMER_ENABLED, LLM-backed requests are logged
+# (never on Vercel) so a background thread can precompute the
+# CACHE_WARMER_TOP_N most requested combinations per feature
+# (seen at least CACHE_WARMER_MIN_COUNT times in the last CACHE_WARMER_WINDOW_DAYS)
+# every CACHE_WARMER_INTERVAL seconds. Warming makes one call at a time,
+# CACHE_WARMER_MIN_INTERVAL seconds apart, and only while at most
+# CACHE_WARMER_MAX_LIVE_INFLIGHT live LLM calls are running. The cache is per
+# process, so each worker warms its own copy.
+CACHE_WARMER_ENABLED = os.environ.get('CACHE_WARMER_ENABLED', '').lower() in ('1', 'true', 'yes')
+CACHE_WARMER_LOG_ENABLED = CACHE_WARMER_ENABLED and not os.environ.get('VERCEL')
+CACHE_WARMER_LOG_PATH = os.environ.get('CACHE_WARMER_LOG_PATH', os.path.join(OUTPUT_DIR, 'request_log.jsonl'))
+CACHE_WARMER_LOG_MAX_BYTES = int(os.environ.get('CACHE_WARMER_LOG_MAX_BYTES', 5 * 1024 * 1024))
+CACHE_WARMER_TOP_N = int(os.environ.get('CACHE_WARMER_TOP_N', 20))
+CACHE_WARMER_MIN_COUNT = int(os.environ.get('CACHE_WARMER_MIN_COUNT', 2))
+CACHE_WARMER_WINDOW_DAYS = float(os.environ.get('CACHE_WARMER_WINDOW_DAYS', 7))
+CACHE_WARMER_INTERVAL = float(os.environ.get('CACHE_WARMER_INTERVAL', 3600))
+CACHE_WARMER_INITIAL_DELAY = float(os.environ.get('CACHE_WARMER_INITIAL_DELAY', 60))
+CACHE_WARMER_MIN_INTERVAL = float(os.environ.get('CACHE_WARMER_MIN_INTERVAL', 2.0))
+CACHE_WARMER_MAX_LIVE_INFLIGHT = int(os.environ.get('CACHE_WARMER_MAX_LIVE_INFLIGHT', 0))
+CACHE_WARMER_MAX_BUSY_WAIT = float(os.environ.get('CACHE_WARMER_MAX_BUSY_WAIT', 60))
@@ -0,0 +1,38 @@
+import time
+
+import config
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage cannot finish inside the request's time budget"""
+
+
+class Deadline:
+    """Time budget for one request, shared by every stage that handles it"""
+
+    def __init__(self, seconds, reserve=None):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        # Time held back so a fallback response can still be rendered
+        self.reserve = config.DEADLINE_RENDER_RESERVE if reserve is None else reserve
+
+    def remaining(self):
+        """Seconds left before the request deadline"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def budget(self):
+        """Seconds left for work after reserving time to render a response"""
+        return max(0.0, self.remaining() - self.reserve)
+
+    def expired(self):
+        return self.budget() <= 0
+
+    def allows_llm(self):
+        """Whether enough budget is left to make an LLM call worthwhile"""
+        return self.budget() >= config.DEADLINE_MIN_LLM_SECONDS
+
+
+def for_route(route):
+    """Create the deadline for a request to the given route"""
+    seconds = config.REQUEST_DEADLINES.get(route, config.REQUEST_DEADLINE_SECONDS)
+    return Deadline(seconds)
@@ -0,0 +1,138 @@
+import gzip
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+
+from flask import current_app, g, render_template, request, session
+
+import config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Response compression negotiated by Accept-Encoding, ETags with conditional
+# GET for near-static pages, and a cache of pages rendered for anonymous
+# visitors. The ETag is a hash of the uncompressed body with the content
+# coding appended, so each representation has its own validator. Compressed
+# bodies of those pages are kept too, so an unchanged page is compressed once.
+
+COMPRESSIBLE_TYPES = {
+    "text/html", "text/css", "text/plain", "text/javascript", "application/javascript",
+    "application/json", "image/svg+xml",
+}
+
+_lock = threading.Lock()
+_pages = {}                  # template -> html rendered for anonymous visitors
+_compressed = OrderedDict()  # (body hash, coding) -> compressed body
+_stats = Counter()
+
+
+def _encode(body, coding):
+    if coding == "br":
+        return brotli.compress(body, quality=config.COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(body, compresslevel=config.COMPRESSION_LEVEL, mtime=0)
+
+
+def negotiate():
+    """Best content coding the client accepts, or None for identity"""
+    offers = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offers)
+
+
+def conditional_page(template):
+    """Render a near-static page with an ETag; anonymous renders are reused.
+
+    A page is served from the cache only when nobody is logged in and no
+    flashed message is waiting, since both change the rendered navigation.
+    """
+    g.http_conditional = True
+    anonymous = "user_id" not in session and "_flashes" not in session
+    # Templates reloaded from disk (debug mode) are never cached
+    if not (anonymous and config.PAGE_CACHE_ENABLED) or current_app.templates_auto_reload:
+        return render_template(template)
+    html = _pages.get(template)
+    if html is None:
+        html = render_template(template)
+        with _lock:
+            _pages[template] = html
+            _stats["page_misses"] += 1
+    else:
+        with _lock:
+            _stats["page_hits"] += 1
+    return html
+
+
+def _compress_cached(digest, body, coding):
+    key = (digest, coding)
+    with _lock:
+        if key in _compressed:
+            _compressed.move_to_end(key)
+            return _compressed[key]
+    data = _encode(body, coding)
+    with _lock:
+        _compressed[key] = data
+        while len(_compressed) > config.COMPRESSION_CACHE_SIZE:
+            _compressed.popitem(last=False)
+    return data
+
+
+def finalize(response):
+    """Compress the body and answer conditional GETs (after_request hook)"""
+    conditional = g.pop("http_conditional", False)
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        # Streamed NDJSON stays uncompressed so no line is held back in a buffer
+        return response
+
+    body = response.get_data()
+    digest = hashlib.sha1(body).hexdigest() if conditional else None
+    coding = negotiate() if config.COMPRESSION_ENABLED else None
+    if config.COMPRESSION_ENABLED:
+        response.vary.add("Accept-Encoding")
+    if coding and len(body) >= config.COMPRESSION_MIN_BYTES:
+        data = _compress_cached(digest, body, coding) if conditional else _encode(body, coding)
+        response.set_data(data)
+        response.headers["Content-Encoding"] = coding
+        with _lock:
+            _stats["compressed"] += 1
+            _stats["bytes_in"] += len(body)
+            _stats["bytes_out"] += len(data)
+    else:
+        coding = None
+
+    if conditional:
+        response.set_etag(digest + ("-" + coding if coding else ""))
+        if "Cache-Control" not in response.headers:
+            # The browser keeps the page but checks it is current on every visit
+            response.headers["Cache-Control"] = "private, no-cache"
+        response.make_conditional(request)
+        if response.status_code == 304:
+            with _lock:
+                _stats["not_modified"] += 1
+    return response
+
+
+def clear():
+    with _lock:
+        _pages.clear()
+        _compressed.clear()
+
+
+def stats():
+    with _lock:
+        counters = dict(_stats)
+        pages = sorted(_pages)
+    saved = counters.get("bytes_in", 0) - counters.get("bytes_out", 0)
+    return {
+        "compression": config.COMPRESSION_ENABLED,
+        "brotli": brotli is not None,
+        "page_cache": config.PAGE_CACHE_ENABLED,
+        "cached_pages": pages,
+        "counters": counters,
+        "bytes_saved": saved,
+    }
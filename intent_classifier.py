@@ -0,0 +1,155 @@
+import re
+import threading
+from collections import Counter
+
+import config
+
+# Phrase weights per chatbot intent. Multi-word phrases are matched as a unit
+# and weigh more than the single keywords they contain.
+INTENT_PHRASES = {
+    "hello": {
+        "hello": 1.0, "hi": 1.0, "hey": 1.0, "greetings": 1.0, "hi there": 1.5,
+        "hello there": 1.5, "good morning": 1.5, "good afternoon": 1.5, "good evening": 1.5,
+    },
+    "thanks": {
+        "thanks": 1.0, "thank you": 1.5, "thx": 1.0, "cheers": 0.8, "appreciate it": 1.5,
+        "that helps": 1.2, "that was helpful": 1.5,
+    },
+    "goodbye": {
+        "bye": 1.0, "goodbye": 1.0, "see you": 1.2, "see you later": 1.5, "that's all": 1.2,
+        "gotta go": 1.2, "talk later": 1.2,
+    },
+    "help": {
+        "help": 1.0, "what can you do": 2.0, "how does this work": 2.0, "get started": 1.5,
+        "where do i start": 1.5, "options": 0.8, "what": 0.3, "how": 0.3,
+    },
+    "technical": {
+        "technical": 1.0, "technical questions": 1.5, "coding": 1.0, "code": 0.8,
+        "programming": 1.0, "technology": 0.8, "system design": 1.5, "algorithms": 1.0,
+        "data structures": 1.5,
+    },
+    "behavioral": {
+        "behavioral": 1.0, "behavioural": 1.0, "behavioral questions": 1.5, "soft skills": 1.2,
+        "star method": 1.5, "experience": 0.5, "situation": 0.6, "story": 0.6,
+    },
+    "feedback": {
+        "feedback": 1.0, "improve": 0.8, "better": 0.5, "practice": 0.3, "tips": 1.0,
+        "mock interview": 1.5,
+    },
+}
+
+# Intents a canned reply can answer. Feedback is always about the candidate's
+# own answers or a mock interview, which only the LLM can follow.
+LOCAL_INTENTS = {"hello", "thanks", "goodbye", "help", "technical", "behavioral"}
+
+# Words that carry no intent of their own and do not lower the confidence
+FILLER_WORDS = {
+    "a", "about", "again", "all", "an", "and", "any", "are", "ask", "can", "could", "do",
+    "for", "give", "i", "i'm", "im", "in", "is", "it", "just", "let", "let's", "lets", "like",
+    "lot", "me", "more", "much", "my", "need", "now", "of", "ok", "okay", "on", "please",
+    "question", "questions", "really", "so", "some", "the", "there", "this", "to", "us", "very",
+    "want", "we", "with", "would", "you", "your",
+}
+
+# Phrase -> (intent, weight); one alternation, longest phrases first, compiled once
+_PHRASES = {
+    phrase: (intent, weight)
+    for intent, phrases in INTENT_PHRASES.items()
+    for phrase, weight in phrases.items()
+}
+_PHRASE_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(p) for p in sorted(_PHRASES, key=len, reverse=True)) + r")\b"
+)
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+class Intent:
+    """Classified intent of one chatbot message with its confidence in [0, 1]"""
+
+    __slots__ = ("name", "confidence", "words", "open_words")
+
+    def __init__(self, name, confidence, words, open_words=0):
+        self.name = name
+        self.confidence = confidence
+        self.words = words
+        # Words a canned reply cannot address: unexplained ones and those of
+        # phrases from intents outside LOCAL_INTENTS
+        self.open_words = open_words
+
+    @property
+    def local(self):
+        """Whether the message is routine enough to answer without the LLM.
+
+        Only messages made up entirely of filler words and phrases of locally
+        answered intents qualify, so "feedback on my answer" goes to the LLM.
+        """
+        return (self.name in LOCAL_INTENTS
+                and not self.open_words
+                and self.confidence >= config.INTENT_LOCAL_THRESHOLD
+                and self.words <= config.INTENT_MAX_LOCAL_WORDS)
+
+
+def classify(message):
+    """Score every intent in one scan of the message.
+
+    Confidence is the winning intent's share of the total score times the
+    share of words explained by a matched phrase or a filler word, so a
+    greeting followed by a real answer is not treated as a greeting. Weak
+    keywords such as "how" alone never reach full confidence.
+    """
+    text = str(message or "").lower()
+    scores = Counter()
+    unexplained = 0
+    open_words = 0
+    words = 0
+    position = 0
+    for match in _PHRASE_RE.finditer(text):
+        for word in _WORD_RE.findall(text, position, match.start()):
+            words += 1
+            unexplained += word not in FILLER_WORDS
+        phrase_words = match.group(0).count(" ") + 1
+        words += phrase_words
+        intent, weight = _PHRASES[match.group(0)]
+        if intent not in LOCAL_INTENTS:
+            open_words += phrase_words
+        scores[intent] += weight
+        position = match.end()
+    for word in _WORD_RE.findall(text, position):
+        words += 1
+        unexplained += word not in FILLER_WORDS
+
+    open_words += unexplained
+    if not scores:
+        return Intent(None, 0.0, words, open_words)
+    if "hello" in scores and max((v for k, v in scores.items() if k != "hello"), default=0) >= 1.0:
+        # "Hi, can you help?" is a request for help; the greeting is just politeness
+        del scores["hello"]
+    name, top = scores.most_common(1)[0]
+    margin = top / sum(scores.values())
+    coverage = 1 - unexplained / words if words else 0.0
+    return Intent(name, round(min(top, 1.0) * margin * coverage, 3), words, open_words)
+
+
+# How each message was answered: "local" (fast path), "llm", or "fallback"
+_lock = threading.Lock()
+_served = Counter()
+_local_intents = Counter()
+
+
+def record(served_by, intent=None):
+    with _lock:
+        _served[served_by] += 1
+        if served_by == "local" and intent:
+            _local_intents[intent] += 1
+
+
+def stats():
+    """Share of chatbot messages answered locally"""
+    with _lock:
+        total = sum(_served.values())
+        return {
+            "messages": total,
+            "served": dict(_served),
+            "local_share": round(_served["local"] / total, 3) if total else 0.0,
+            "local_intents": dict(_local_intents),
+        }
@@ -1,5 +1,10 @@
 import json
 import random
+import llm_client
+import profiling
+import semantic_cache
+
+MODEL_NAME = "gemini-2.0-flash"
 
 # Try to import Google Generative AI package
 GENAI_AVAILABLE = False
@@ -11,25 +16,29 @@ try:
     # Configure Gemini API if available
     if hasattr(config, 'GEMINI_API_KEY'):
         genai.configure(api_key=config.GEMINI_API_KEY)
-        model = genai.GenerativeModel(model_name="gemini-2.0-flash")
+        model = genai.GenerativeModel(model_name=MODEL_NAME)
 except ImportError:
     print("[WARNING] Google Generative AI package not available. Using fallback mode.")
 
-def get_interview_questions(job_role="", experience_level=""):
+def get_interview_questions(job_role="", experience_level="", use_ai=True, deadline=None):
     """Get interview questions based on job role and experience level"""
     try:
-        if GENAI_AVAILABLE and job_role:
-            return get_questions_with_ai(job_role, experience_level)
+        cached = semantic_cache.cache.get('interview_questions', semantic_cache.questions_key(job_role, experience_level))
+        if cached is not None:
+            return cached
+        if GENAI_AVAILABLE and use_ai and job_role and (deadline is None or deadline.allows_llm()):
+            return get_questions_with_ai(job_role, experience_level, deadline)
         else:
             return generate_mock_questions(job_role, experience_level)
     except Exception as e:
         print(f"[ERROR] Error getting interview questions: {str(e)}")
         return generate_mock_questions(job_role, experience_level)
 
-def get_questions_with_ai(job_role, experience_level):
+def get_questions_with_ai(job_role, experience_level, deadline=None):
     """Get interview questions using AI"""
     try:
-        prompt = f"""
+        with profiling.span('prompt'):
+            prompt = f"""
         Generate interview questions for a {job_role} position at {experience_level} level.
         
         Return a JSON object with the following structure:
@@ -61,8 +70,9 @@ def get_questions_with_ai(job_role, experience_level):
         Include 3-5 questions per category, appropriate for the role and experience level.
         """
         
-        response = model.generate_content(prompt)
+        response = llm_client.generate(model, prompt, MODEL_NAME, 'interview_questions', deadline)
         result = json.loads(response.text)
+        semantic_cache.cache.put('interview_questions', semantic_cache.questions_key(job_role, experience_level), result)
         return result
     except Exception as e:
         print(f"[ERROR] AI interview questions failed: {str(e)}")
@@ -1,6 +1,13 @@
 import json
 import random
 from datetime import datetime, timedelta
+import batching
+import llm_client
+import profiling
+import semantic_cache
+import streaming_json
+
+MODEL_NAME = "gemini-2.0-flash"
 
 # Try to import Google Generative AI package
 GENAI_AVAILABLE = False
@@ -12,25 +19,27 @@ try:
     # Configure Gemini API if available
     if hasattr(config, 'GEMINI_API_KEY'):
         genai.configure(api_key=config.GEMINI_API_KEY)
-        model = genai.GenerativeModel(model_name="gemini-2.0-flash")
+        model = genai.GenerativeModel(model_name=MODEL_NAME)
 except ImportError:
     print("[WARNING] Google Generative AI package not available. Using fallback mode.")
 
-def find_job_matches(job_position="", location="", skills=""):
+def find_job_matches(job_position="", location="", skills="", use_ai=True, deadline=None):
     """Find job matches based on position, location, and skills"""
     try:
-        if GENAI_AVAILABLE and job_position:
-            return find_jobs_with_ai(job_position, location, skills)
+        cached = semantic_cache.cache.get('find_jobs', semantic_cache.jobs_key(job_position, location, skills))
+        if cached is not None:
+            return cached
+        if GENAI_AVAILABLE and use_ai and job_position and (deadline is None or deadline.allows_llm()):
+            return find_jobs_with_ai(job_position, location, skills, deadline)
         else:
             return generate_mock_jobs(job_position, location, skills)
     except Exception as e:
         print(f"[ERROR] Error finding job matches: {str(e)}")
         return generate_mock_jobs(job_position, location, skills)
 
-def find_jobs_with_ai(job_position, location, skills):
-    """Find jobs using AI"""
-    try:
-        prompt = f"""
+def get_jobs_prompt(job_position, location, skills):
+    """Generate prompt for job search"""
+    return f"""
         Search for job listings for the position: {job_position}
         Location: {location if location else 'Remote/Anywhere'}
         Skills: {skills if skills else 'General skills'}
@@ -51,14 +60,105 @@ def find_jobs_with_ai(job_position, location, skills):
         
         Make sure the jobs are relevant to the position and skills mentioned.
         """
-        
-        response = model.generate_content(prompt)
-        result = json.loads(response.text)
-        return result
+
+def find_jobs_with_ai(job_position, location, skills, deadline=None):
+    """Find jobs using AI"""
+    try:
+        return ask_jobs(job_position, location, skills, deadline)
     except Exception as e:
         print(f"[ERROR] AI job matching failed: {str(e)}")
         return generate_mock_jobs(job_position, location, skills)
 
+def ask_jobs(job_position, location, skills, deadline=None):
+    """Ask the model for job listings and cache them; raises if the call fails"""
+    with profiling.span('prompt'):
+        prompt = get_jobs_prompt(job_position, location, skills)
+    
+    response = llm_client.generate(model, prompt, MODEL_NAME, 'find_jobs', deadline)
+    result = json.loads(response.text)
+    semantic_cache.cache.put('find_jobs', semantic_cache.jobs_key(job_position, location, skills), result)
+    return result
+
+def stream_job_matches(job_position="", location="", skills="", use_ai=True, deadline=None):
+    """Yield job listings one at a time as the model generates them.
+    
+    Mock listings served when the model gives nothing usable are marked with "fallback": True.
+    """
+    count = 0
+    key = semantic_cache.jobs_key(job_position, location, skills)
+    cached = semantic_cache.cache.get('find_jobs', key)
+    if cached is not None and cached.get('jobs'):
+        yield from cached['jobs']
+        return
+    if GENAI_AVAILABLE and use_ai and job_position and (deadline is None or deadline.allows_llm()):
+        try:
+            parser = streaming_json.ArrayItemParser()
+            prompt = get_jobs_prompt(job_position, location, skills)
+            jobs = []
+            for text in llm_client.generate_stream(model, prompt, MODEL_NAME, 'find_jobs', deadline):
+                for job in parser.feed(text):
+                    if isinstance(job, dict):
+                        count += 1
+                        jobs.append(job)
+                        yield job
+                if parser.done:
+                    break
+            if parser.done and jobs:
+                semantic_cache.cache.put('find_jobs', key, {'jobs': jobs})
+        except Exception as e:
+            print(f"[ERROR] AI job streaming failed after {count} jobs: {str(e)}")
+    
+    # Nothing usable came back from the model
+    if not count:
+        for job in generate_mock_jobs(job_position, location, skills)["jobs"]:
+            yield dict(job, fallback=True)
+
+JOB_LISTING_SCHEMA = """{
+        "jobs": [
+            {
+                "title": "Job Title",
+                "company": "Company Name",
+                "location": "Location",
+                "posted_date": "Recent date",
+                "description": "Short job description",
+                "url": "#"
+            }
+        ]
+    }"""
+
+def find_job_matches_batch(queries, use_ai=True, deadline=None):
+    """Find job matches for many queries, packing small ones into shared LLM prompts"""
+    return batching.run_batch(
+        queries, ('job_position', 'location', 'skills'),
+        lambda chunk: find_jobs_with_ai_packed(chunk, deadline), generate_mock_jobs,
+        use_ai=GENAI_AVAILABLE and use_ai, needs_ai=lambda key: key[0], route='jobs',
+        feature='find_jobs', cache_key=semantic_cache.jobs_key,
+    )
+
+def find_jobs_with_ai_packed(queries, deadline=None):
+    """Answer several (job_position, location, skills) queries with one LLM call"""
+    if deadline is not None and not deadline.allows_llm():
+        return [None] * len(queries)
+    try:
+        if len(queries) == 1:
+            results = [ask_jobs(*queries[0], deadline)]
+            return [r if isinstance(r, dict) and isinstance(r.get("jobs"), list) else None for r in results]
+        prompt = batching.build_packed_prompt(
+            "Search for job listings for each of the following queries. Return 5-8 relevant listings per query.",
+            [
+                f"Position: {position}; Location: {location if location else 'Remote/Anywhere'}; "
+                f"Skills: {skills if skills else 'General skills'}"
+                for position, location, skills in queries
+            ],
+            JOB_LISTING_SCHEMA,
+        )
+        response = llm_client.generate(model, prompt, MODEL_NAME, 'find_jobs', deadline)
+        results = batching.split_packed_response(response.text, len(queries))
+        return [r if isinstance(r, dict) and isinstance(r.get("jobs"), list) else None for r in results]
+    except Exception as e:
+        print(f"[ERROR] AI batch job matching failed: {str(e)}")
+        return [None] * len(queries)
+
 def generate_mock_jobs(job_position, location, skills):
     """Generate mock job listings when AI is not available"""
     job_titles = [
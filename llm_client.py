@@ -0,0 +1,29 @@
+import llm_router
+import profiling
+import usage
+from deadline import DeadlineExceeded
+
+
+def generate(model, prompt, model_name, endpoint, deadline=None):
+    """Send the prompt to the fastest healthy backend for the endpoint.
+
+    The caller's own model is used for its "gemini:<model_name>" backend; the
+    other backends come from config.LLM_ROUTES (see llm_router). Tokens are
+    charged to the request's user, and a user over budget gets BudgetExceeded
+    so the caller falls back to its local generator.
+    """
+    if deadline is not None and not deadline.allows_llm():
+        raise DeadlineExceeded(f"Only {deadline.budget():.2f}s left for the LLM call")
+    user = usage.current_user()
+    usage.check_budget(user)
+    with profiling.span('llm'):
+        return llm_router.router.generate(endpoint, prompt, deadline, default=('gemini:' + model_name, model), user=user)
+
+
+def generate_stream(model, prompt, model_name, endpoint, deadline=None):
+    """Yield the response text in chunks as the backend generates it"""
+    if deadline is not None and not deadline.allows_llm():
+        raise DeadlineExceeded(f"Only {deadline.budget():.2f}s left for the LLM call")
+    user = usage.current_user()
+    usage.check_budget(user)
+    yield from llm_router.router.generate_stream(endpoint, prompt, deadline, default=('gemini:' + model_name, model), user=user)
@@ -0,0 +1,381 @@
+import json
+import queue
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+import admission
+import circuit_breaker
+import config
+import llm_stub
+import usage
+from deadline import DeadlineExceeded
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+# Calls run here so the caller can stop waiting at its deadline and so a hedge
+# can be started while the first request is still in flight. The Gemini SDK has
+# no per-call timeout, so an abandoned call finishes in the background and its
+# latency still feeds the profile.
+_executor = ThreadPoolExecutor(max_workers=config.LLM_MAX_WORKERS, thread_name_prefix="llm")
+
+
+def _submit(fn, *args):
+    """Run fn on the LLM pool, keeping the caller's admission slot until it finishes.
+
+    future.cancel() cannot stop a call that is already running, so a call the
+    caller stopped waiting for still counts against admission while it runs.
+    """
+    ticket = admission.current()
+    held = ticket is not None and ticket.hold()
+    future = _executor.submit(fn, *args)
+    if held:
+        future.add_done_callback(lambda _: ticket.unhold())
+    return future
+
+
+class TextResponse:
+    def __init__(self, text, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class UsageMetadata:
+    """Token counts in the shape of Gemini's usage_metadata"""
+
+    def __init__(self, prompt_token_count, candidates_token_count):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+class OpenAIModel:
+    """Chat completions client with the generate_content interface of a Gemini model"""
+
+    def __init__(self, model_name, api_key=None, url=None, timeout=60):
+        self.model_name = model_name
+        self.api_key = api_key or config.OPENAI_API_KEY
+        self.url = url or config.OPENAI_API_URL
+        self.timeout = timeout
+
+    def generate_content(self, prompt, stream=False):
+        response = requests.post(
+            self.url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={"model": self.model_name, "messages": [{"role": "user", "content": prompt}], "stream": stream},
+            timeout=self.timeout,
+            stream=stream,
+        )
+        response.raise_for_status()
+        if stream:
+            return self._stream(response)
+        data = response.json()
+        counts = data.get("usage") or {}
+        metadata = None
+        if counts.get("prompt_tokens"):
+            metadata = UsageMetadata(counts["prompt_tokens"], counts.get("completion_tokens", 0))
+        return TextResponse(data["choices"][0]["message"]["content"], metadata)
+
+    @staticmethod
+    def _stream(response):
+        # Server-sent events: one "data: {...}" line per delta, then "data: [DONE]"
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data: "):
+                continue
+            data = line[len("data: "):]
+            if data == "[DONE]":
+                break
+            delta = json.loads(data)["choices"][0].get("delta", {})
+            if delta.get("content"):
+                yield TextResponse(delta["content"])
+
+
+def _iter_text(client, prompt):
+    """Text chunks of a streamed response; clients that cannot stream yield the whole text once"""
+    try:
+        response = client.generate_content(prompt, stream=True)
+    except TypeError:
+        yield client.generate_content(prompt).text
+        return
+    for chunk in response:
+        yield chunk.text
+
+
+class BackendStats:
+    """Moving latency and error profile of one backend on one endpoint"""
+
+    def __init__(self, alpha=None, window=200):
+        self.alpha = config.LLM_ROUTER_EWMA_ALPHA if alpha is None else alpha
+        self.latency = None     # moving average of successful call latency, seconds
+        self.error_rate = 0.0   # moving average of failures
+        self.calls = 0
+        self.failures = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency, failed):
+        with self._lock:
+            self.calls += 1
+            self.error_rate += self.alpha * ((1.0 if failed else 0.0) - self.error_rate)
+            if failed:
+                self.failures += 1
+                return
+            self._latencies.append(latency)
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.alpha * (latency - self.latency)
+
+    def expected_latency(self):
+        """Average latency scaled by the expected number of tries; untried backends come first"""
+        if self.latency is None:
+            return float("inf") if self.calls else 0.0
+        return self.latency / max(1.0 - self.error_rate, 0.05)
+
+    def percentile(self, pct):
+        """Latency percentile, or None until there are enough samples"""
+        with self._lock:
+            values = sorted(self._latencies)
+        if len(values) < config.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+    def snapshot(self):
+        p95 = self.percentile(95)
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "error_rate": round(self.error_rate, 3),
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "expected_latency": round(self.expected_latency(), 3) if self.latency is not None else None,
+            "p95": round(p95, 3) if p95 is not None else None,
+        }
+
+
+class Router:
+    """Sends each endpoint's calls to its fastest healthy backend, hedging slow calls"""
+
+    def __init__(self, routes=None, clients=None, hedge=None, explore_rate=None):
+        self.routes = config.LLM_ROUTES if routes is None else routes
+        self.hedge = config.LLM_HEDGE_ENABLED if hedge is None else hedge
+        self.explore_rate = config.LLM_ROUTER_EXPLORE_RATE if explore_rate is None else explore_rate
+        self._explicit = dict(clients or {})
+        self._clients = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self, key, endpoint):
+        with self._lock:
+            if (key, endpoint) not in self._stats:
+                self._stats[(key, endpoint)] = BackendStats()
+            return self._stats[(key, endpoint)]
+
+    def _client(self, key, endpoint, default):
+        if key in self._explicit:
+            return self._explicit[key]
+        if config.LLM_BACKEND == 'stub':
+            cache_key = (key, endpoint)
+            if cache_key not in self._clients:
+                self._clients[cache_key] = llm_stub.StubModel(endpoint, config.LLM_STUB_LATENCIES.get(key))
+            return self._clients[cache_key]
+        if default is not None and key == default[0] and default[1] is not None:
+            return default[1]
+        if key not in self._clients:
+            provider, _, model_name = key.partition(":")
+            client = None
+            if provider == "gemini" and genai is not None:
+                client = genai.GenerativeModel(model_name=model_name)
+            elif provider == "openai" and config.OPENAI_API_KEY:
+                client = OpenAIModel(model_name)
+            self._clients[key] = client
+        return self._clients[key]
+
+    def candidates(self, endpoint, default=None):
+        """Available (key, client) pairs, healthy and fastest first"""
+        keys = self.routes.get(endpoint) or config.LLM_DEFAULT_BACKENDS
+        backends = []
+        for key in dict.fromkeys(keys):
+            client = self._client(key, endpoint, default)
+            if client is not None:
+                backends.append((key, client))
+        if not backends and default is not None and default[1] is not None:
+            backends.append(default)
+
+        def rank(backend):
+            healthy = circuit_breaker.get_breaker(backend[0], endpoint).state != circuit_breaker.OPEN
+            return (not healthy, self.stats(backend[0], endpoint).expected_latency())
+
+        backends.sort(key=rank)
+        if len(backends) > 1 and self.explore_rate and random.random() < self.explore_rate:
+            # Now and then try another backend so a recovered one gets noticed
+            backends.insert(0, backends.pop(random.randrange(1, len(backends))))
+        return backends
+
+    def _attempt(self, endpoint, backend, prompt, user=None):
+        key, client = backend
+        stats = self.stats(key, endpoint)
+        start = time.monotonic()
+        try:
+            response = circuit_breaker.get_breaker(key, endpoint).call(client.generate_content, prompt)
+        except circuit_breaker.CircuitOpenError:
+            raise
+        except Exception:
+            stats.record(time.monotonic() - start, failed=True)
+            raise
+        latency = time.monotonic() - start
+        stats.record(latency, failed=False)
+        # Hedged calls are billed too, so every successful attempt is counted
+        usage.record_response(user, endpoint, key, prompt, response, latency)
+        return response
+
+    def _hedge_delay(self, endpoint, key, deadline):
+        delay = self.stats(key, endpoint).percentile(config.LLM_HEDGE_PERCENTILE)
+        if delay is None:
+            return None
+        return min(delay, max(deadline.budget(), 0.0)) if deadline is not None else delay
+
+    def _call(self, endpoint, primary, secondary, prompt, deadline, user=None):
+        first = _submit(self._attempt, endpoint, primary, prompt, user)
+        pending = {first}
+        delay = self._hedge_delay(endpoint, primary[0], deadline) if secondary else None
+        if delay is not None:
+            done, _ = wait(pending, timeout=delay)
+            if not done and (deadline is None or deadline.allows_llm()):
+                print(f"[DEBUG] Hedging {endpoint} on {secondary[0]} after {delay:.2f}s")
+                self._count("hedges")
+                pending.add(_submit(self._attempt, endpoint, secondary, prompt, user))
+
+        error = None
+        while pending:
+            timeout = max(deadline.budget(), 0.0) if deadline is not None else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(f"LLM call for {endpoint} exceeded its deadline")
+            for future in done:
+                try:
+                    response = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if future is not first:
+                    self._count("hedge_wins")
+                return response
+        raise error
+
+    def generate(self, endpoint, prompt, deadline=None, default=None, user=None):
+        """Call the best backend for endpoint, failing over to the next one on errors"""
+        backends = self.candidates(endpoint, default)
+        if not backends:
+            raise RuntimeError(f"No LLM backend available for {endpoint}")
+        self._count("calls")
+        error = None
+        for attempt, primary in enumerate(backends[:config.LLM_ROUTER_MAX_ATTEMPTS]):
+            if deadline is not None and not deadline.allows_llm():
+                break
+            if attempt:
+                self._count("failovers")
+                print(f"[WARNING] Failing over {endpoint} to {primary[0]}: {str(error)}")
+            secondary = None
+            if self.hedge:
+                secondary = backends[attempt + 1] if attempt + 1 < len(backends) else primary
+            try:
+                return self._call(endpoint, primary, secondary, prompt, deadline, user)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                error = e
+        raise error or DeadlineExceeded(f"No time left to call a backend for {endpoint}")
+
+    def _stream(self, endpoint, backend, prompt, deadline, user=None):
+        key, client = backend
+        stats = self.stats(key, endpoint)
+        breaker = circuit_breaker.get_breaker(key, endpoint)
+        if not breaker.allow_request():
+            raise circuit_breaker.CircuitOpenError(breaker.name, breaker.retry_in())
+        chunks = queue.Queue()
+        start = time.monotonic()
+
+        def produce():
+            failed = True
+            texts = []
+            try:
+                for text in _iter_text(client, prompt):
+                    texts.append(text)
+                    chunks.put(("chunk", text))
+                failed = False
+                chunks.put(("done", None))
+            except Exception as e:
+                chunks.put(("error", e))
+            finally:
+                latency = time.monotonic() - start
+                breaker.record(failed, latency)
+                stats.record(latency, failed)
+                if not failed:
+                    usage.record_response(user, endpoint, key, prompt, None, latency, "".join(texts))
+
+        _submit(produce)
+        while True:
+            timeout = max(deadline.budget(), 0.0) if deadline is not None else None
+            try:
+                kind, value = chunks.get(timeout=timeout)
+            except queue.Empty:
+                raise DeadlineExceeded(f"Streamed LLM call for {endpoint} exceeded its deadline")
+            if kind == "error":
+                raise value
+            if kind == "done":
+                return
+            yield value
+
+    def generate_stream(self, endpoint, prompt, deadline=None, default=None, user=None):
+        """Yield response text as the best backend produces it.
+
+        Fails over to the next backend only before the first chunk; streamed
+        calls are not hedged.
+        """
+        backends = self.candidates(endpoint, default)
+        if not backends:
+            raise RuntimeError(f"No LLM backend available for {endpoint}")
+        self._count("calls")
+        error = None
+        for attempt, backend in enumerate(backends[:config.LLM_ROUTER_MAX_ATTEMPTS]):
+            if deadline is not None and not deadline.allows_llm():
+                break
+            if attempt:
+                self._count("failovers")
+                print(f"[WARNING] Failing over {endpoint} stream to {backend[0]}: {str(error)}")
+            started = False
+            try:
+                for text in self._stream(endpoint, backend, prompt, deadline, user):
+                    started = True
+                    yield text
+                return
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                if started:
+                    raise
+                error = e
+        raise error or DeadlineExceeded(f"No time left to call a backend for {endpoint}")
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self._stats)
+            counters = dict(self._counters)
+        endpoints = {}
+        for (key, endpoint), backend_stats in stats.items():
+            endpoints.setdefault(endpoint, {})[key] = backend_stats.snapshot()
+        return {"hedging": self.hedge, "counters": counters, "endpoints": endpoints}
+
+
+router = Router()
@@ -0,0 +1,130 @@
+import json
+import random
+import re
+import time
+
+import config
+
+# Canned responses shaped like the real prompts ask for, keyed by endpoint
+STUB_RESPONSES = {
+    "process_resume": {
+        "name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "phone": "555-123-4567",
+        "summary": "Software engineer with backend and cloud experience",
+        "skills": ["Python", "SQL", "AWS"],
+        "experience": [
+            {
+                "job_role": "Software Engineer",
+                "company": "TechCorp",
+                "duration": "2020 - Present",
+                "responsibilities": ["Built APIs", "Maintained CI pipelines"]
+            }
+        ],
+        "education": [
+            {"degree": "B.S. Computer Science", "institution": "State University", "years": "2016 - 2020"}
+        ],
+        "resume_score": 80
+    },
+    "find_jobs": {
+        "jobs": [
+            {
+                "title": title,
+                "company": "StubCorp",
+                "location": "Remote",
+                "posted_date": "Recent",
+                "description": "Stub listing returned by the local LLM stub.",
+                "url": "#"
+            }
+            for title in ["Software Engineer", "Backend Engineer", "Platform Engineer",
+                          "Site Reliability Engineer", "Full Stack Developer"]
+        ]
+    },
+    "career_guidance": {
+        "skill_gap_analysis": ["System design", "Cloud architecture", "Mentoring"],
+        "skill_development_plan": ["Lead a design review", "Ship a cloud project", "Mentor a junior"],
+        "certifications_courses": ["AWS Certified Solutions Architect"],
+        "project_ideas": ["Build a distributed task queue"],
+        "estimated_timeline": {"total_estimated_time": "6-12 months"},
+        "job_readiness_indicator": "Ready"
+    },
+    "interview_questions": {
+        "interview_questions": [
+            {
+                "category": "Technical",
+                "questions": [
+                    {"question": "Explain a hash map.", "tips": "Cover collisions.", "difficulty": "Easy"}
+                ]
+            }
+        ]
+    },
+    "interview_chat": "Thanks for sharing. Can you walk me through how you approached that problem?",
+}
+
+
+# Number of pieces a streamed stub response is split into
+STREAM_CHUNKS = 20
+
+# Query ids listed by batching.build_packed_prompt
+PACKED_IDS_RE = re.compile(r"exactly one key per query id \(([^)]*)\)")
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubError(Exception):
+    """Simulated backend failure"""
+
+
+class StubModel:
+    """Offline stand-in for a GenerativeModel that answers after a fixed latency.
+
+    jitter adds an exponentially distributed delay with that mean, stall_rate
+    of the calls hang for stall_seconds more (like a stuck connection) and
+    failure_rate of the calls raise.
+    """
+
+    def __init__(self, endpoint, latency=None, jitter=0.0, failure_rate=0.0,
+                 stall_rate=0.0, stall_seconds=0.0, seed=None):
+        self.endpoint = endpoint
+        self.latency = config.LLM_STUB_LATENCY if latency is None else latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self._random = random.Random(seed)
+
+    def generate_content(self, prompt, stream=False):
+        delay = self.latency + (self._random.expovariate(1 / self.jitter) if self.jitter else 0.0)
+        if self.stall_rate and self._random.random() < self.stall_rate:
+            delay += self.stall_seconds
+        text = self._response_text(prompt)
+        if stream:
+            return self._stream(text, delay)
+        time.sleep(delay)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise StubError(f"Simulated failure for {self.endpoint}")
+        return StubResponse(text)
+
+    def _response_text(self, prompt):
+        """Canned answer for the endpoint, with one copy per query id for packed prompts"""
+        payload = STUB_RESPONSES.get(self.endpoint, "")
+        packed = PACKED_IDS_RE.search(prompt) if isinstance(prompt, str) else None
+        if packed and not isinstance(payload, str):
+            payload = {query_id: payload for query_id in re.findall(r'"(\w+)"', packed.group(1))}
+        return payload if isinstance(payload, str) else json.dumps(payload, indent=2)
+
+    def _stream(self, text, delay, chunks=STREAM_CHUNKS):
+        # The latency is spread over the chunks, like tokens arriving from a real model
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise StubError(f"Simulated failure for {self.endpoint}")
+        size = max(1, -(-len(text) // chunks))
+        for start in range(0, len(text), size):
+            time.sleep(delay / chunks)
+            yield StubResponse(text[start:start + size])
+
+
+def get_model(endpoint):
+    return StubModel(endpoint)
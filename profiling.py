@@ -0,0 +1,221 @@
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from functools import wraps
+
+import config
+
+# Opt-in request profiling. A profiled request gets a sampling profiler on its
+# thread (written as collapsed stacks, one "frame;frame;frame count" line per
+# stack, ready for flamegraph.pl or speedscope) and wall-time spans for the
+# stages that call span(). When no profile is active, span() returns a shared
+# no-op context manager, so instrumented code pays one thread-local lookup.
+
+_local = threading.local()
+_lock = threading.Lock()
+_active = 0
+_recent = deque(maxlen=50)
+
+# Runtime switches, changed through /api/admin/profiling
+settings = {
+    "enabled": False,
+    "sample_rate": config.PROFILING_SAMPLE_RATE,
+}
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.profile.open_spans.append(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.profile.open_spans.pop()
+        self.profile.spans.append({
+            "name": self.name,
+            "start_ms": round((self.start - self.profile.started) * 1000, 2),
+            "duration_ms": round((end - self.start) * 1000, 2),
+        })
+        return False
+
+
+def span(name):
+    """Time a stage of the current request when it is being profiled"""
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        return _NULL_SPAN
+    return _Span(profile, name)
+
+
+def timed(name):
+    """Decorator form of span()"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            with span(name):
+                return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+class _Sampler(threading.Thread):
+    """Samples the stack of one thread at a fixed interval"""
+
+    def __init__(self, profile, thread_id, interval):
+        super().__init__(name="profiler", daemon=True)
+        self.profile = profile
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            frames.reverse()
+            # Prefix the open spans so the flamegraph groups samples by stage
+            frames[:0] = [f"[{name}]" for name in list(self.profile.open_spans)]
+            self.stacks[";".join(frames)] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+class Profile:
+    """Spans and stack samples collected for one request"""
+
+    def __init__(self, route, trigger):
+        self.id = uuid.uuid4().hex[:12]
+        self.route = route
+        self.trigger = trigger
+        self.open_spans = []
+        self.spans = []
+        self.started = time.perf_counter()
+        self.duration_ms = 0.0
+        self._sampler = _Sampler(self, threading.get_ident(), config.PROFILING_INTERVAL)
+
+    def __enter__(self):
+        _local.profile = self
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._sampler.stop()
+        _local.profile = None
+        self.duration_ms = round((time.perf_counter() - self.started) * 1000, 2)
+        _finish(self)
+        return False
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self._sampler.stacks.most_common())
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "route": self.route,
+            "trigger": self.trigger,
+            "duration_ms": self.duration_ms,
+            "samples": sum(self._sampler.stacks.values()),
+            "spans": self.spans,
+        }
+
+
+def should_profile(header_value):
+    """Return what triggered profiling for this request, or None"""
+    if header_value and config.PROFILING_TOKEN and hmac.compare_digest(header_value, config.PROFILING_TOKEN):
+        return "header"
+    if settings["enabled"]:
+        return "admin"
+    rate = settings["sample_rate"]
+    if rate and random.random() < rate:
+        return "sample"
+    return None
+
+
+def start(route, trigger):
+    """Return a Profile for the request, or None when too many are already running"""
+    global _active
+    with _lock:
+        if _active >= config.PROFILING_MAX_CONCURRENT:
+            print(f"[WARNING] Skipping profile of {route}: {_active} profiles already running")
+            return None
+        _active += 1
+    return Profile(route, trigger)
+
+
+def _finish(profile):
+    global _active
+    with _lock:
+        _active -= 1
+    summary = profile.summary()
+    _recent.append(summary)
+    try:
+        os.makedirs(config.PROFILING_OUTPUT_DIR, exist_ok=True)
+        stem = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{profile.route}-{profile.id}"
+        base = os.path.join(config.PROFILING_OUTPUT_DIR, stem)
+        with open(base + ".folded", "w", encoding="utf-8") as f:
+            f.write(profile.collapsed())
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"[DEBUG] Profile {profile.id} for {profile.route} written to {base}.folded")
+        _rotate()
+    except Exception as e:
+        print(f"[ERROR] Could not write profile {profile.id}: {str(e)}")
+
+
+def _rotate():
+    """Remove the oldest profiles beyond PROFILING_MAX_FILES"""
+    with _lock:
+        # File names start with the timestamp, so they sort oldest first
+        stems = sorted(name[:-len(".json")] for name in os.listdir(config.PROFILING_OUTPUT_DIR) if name.endswith(".json"))
+        for stem in stems[:max(0, len(stems) - config.PROFILING_MAX_FILES)]:
+            for suffix in (".folded", ".json"):
+                try:
+                    os.remove(os.path.join(config.PROFILING_OUTPUT_DIR, stem + suffix))
+                except OSError:
+                    pass
+
+
+def snapshot():
+    """Current settings and the most recent profiles"""
+    with _lock:
+        return {
+            "enabled": settings["enabled"],
+            "sample_rate": settings["sample_rate"],
+            "active": _active,
+            "output_dir": config.PROFILING_OUTPUT_DIR,
+            "recent": list(_recent),
+        }
@@ -0,0 +1,336 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+import numpy as np
+
+import config
+import semantic_cache
+from resume_parser import TECHNICAL_SKILLS as COMMON_SKILLS
+
+# Ordinal education levels used for matching against job requirements
+EDUCATION_LEVELS = [
+    (4, re.compile(r"\b(ph\.?d|doctorate|doctor of)\b", re.IGNORECASE)),
+    (3, re.compile(r"\b(master|m\.s\.?|m\.sc|m\.a\.?|mba|m\.tech|m\.eng)\b", re.IGNORECASE)),
+    (2, re.compile(r"\b(bachelor|b\.s\.?|b\.sc|b\.a\.?|b\.tech|b\.e\.?|undergraduate)\b", re.IGNORECASE)),
+    (1, re.compile(r"\b(associate|diploma)\b", re.IGNORECASE)),
+]
+
+YEAR_RE = re.compile(r"\b(19[5-9]\d|20\d\d)\b")
+PRESENT_RE = re.compile(r"\b(present|current|now)\b", re.IGNORECASE)
+YEARS_COUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)", re.IGNORECASE)
+TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+# Fields that differ between parses of the same resume and are left out of its identity
+VOLATILE_FIELDS = ("parsed_date", "deduplicated", "degraded")
+
+# Relative weight of each component in the final score
+SKILL_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.25
+EDUCATION_WEIGHT = 0.15
+
+
+def education_level(text):
+    for level, pattern in EDUCATION_LEVELS:
+        if pattern.search(text or ""):
+            return level
+    return 0
+
+
+def experience_years(experience):
+    """Estimate total years of experience from parsed experience entries"""
+    current_year = datetime.now().year
+    total = 0.0
+    for entry in experience or []:
+        duration = str(entry.get("duration", "")) if isinstance(entry, dict) else str(entry)
+        years = [int(y) for y in YEAR_RE.findall(duration)]
+        if years:
+            end = current_year if PRESENT_RE.search(duration) else max(years)
+            total += max(0, end - min(years))
+            continue
+        match = YEARS_COUNT_RE.search(duration)
+        if match:
+            total += float(match.group(1))
+    return min(total, 50.0)
+
+
+def resume_skills(resume):
+    skills = resume.get("skills") or []
+    if isinstance(skills, str):
+        return semantic_cache.canonical_terms(skills, semantic_cache.SKILL_ALIASES)
+    return semantic_cache.canonical_terms(",".join(str(s) for s in skills), semantic_cache.SKILL_ALIASES)
+
+
+def resume_identity(resume):
+    """Key under which a stored resume replaces earlier parses of the same resume.
+
+    The email address when the parse found one, otherwise a hash of the parsed
+    content.
+    """
+    email = str(resume.get("email") or "").strip().lower()
+    if "@" in email:
+        return "email:" + email
+    content = {field: value for field, value in resume.items() if field not in VOLATILE_FIELDS}
+    return "sha1:" + hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class FeatureMatrix:
+    """Precomputed per-resume features: skill vectors, years of experience, education level.
+
+    A resume with the same identity as an earlier one replaces it: the earlier
+    row stays in the matrix but is no longer active.
+
+    FeatureMatrix(new, base=matrix) adds the new resumes to a copy of matrix.
+    The copy shares matrix's skill buffer and only writes rows past the ones
+    matrix can see, so requests still ranking against matrix are unaffected.
+    Only extend the newest matrix.
+    """
+
+    def __init__(self, resumes, base=None):
+        start = len(base) if base is not None else 0
+        self.resumes = (base.resumes if base is not None else []) + list(resumes)
+        self.vocabulary = dict(base.vocabulary) if base is not None else {}
+        # Only the newest matrix looks rows up by identity, so the mapping is shared
+        self._rows = base._rows if base is not None else {}
+        active = np.ones(len(resumes), dtype=bool)
+        self.active = np.concatenate([base.active, active]) if base is not None else active
+        rows = []
+        for row, resume in enumerate(resumes, start):
+            identity = resume_identity(resume)
+            previous = self._rows.get(identity)
+            if previous is not None:
+                self.active[previous] = False
+            self._rows[identity] = row
+            indices = []
+            for skill in resume_skills(resume):
+                indices.append(self.vocabulary.setdefault(skill, len(self.vocabulary)))
+            rows.append(indices)
+
+        # One byte per cell in column-major order, so selecting the few skill
+        # columns a job asks for reads contiguous memory. The buffer has spare
+        # rows and columns so appends rarely need to copy it.
+        count, width = len(self.resumes), max(1, len(self.vocabulary))
+        buffer = base._buffer if base is not None else None
+        if buffer is None or buffer.shape[0] < count or buffer.shape[1] < width:
+            grown = np.zeros((count + max(1024, count // 4), width + 64), dtype=np.uint8, order="F")
+            if base is not None:
+                grown[:start, :base.skills.shape[1]] = base.skills
+            buffer = grown
+        for row, indices in enumerate(rows, start):
+            buffer[row, indices] = 1
+        self._buffer = buffer
+        self.skills = buffer[:count, :width]
+
+        years = np.array([experience_years(r.get("experience")) for r in resumes], dtype=np.float32)
+        education = np.array([
+            max([education_level(json.dumps(e)) for e in r.get("education") or []] or [0])
+            for r in resumes
+        ], dtype=np.int8)
+        self.years = np.concatenate([base.years, years]) if base is not None else years
+        self.education = np.concatenate([base.education, education]) if base is not None else education
+
+    def __len__(self):
+        return len(self.resumes)
+
+
+class JobRequirements:
+    """Skills, years of experience and education level asked for by a job description"""
+
+    def __init__(self, job_description, vocabulary):
+        text = job_description or ""
+        known = set(vocabulary).union(skill.lower() for skill in COMMON_SKILLS)
+        words = [w.rstrip(".") for w in TOKEN_RE.findall(text.lower())]
+        found = set()
+        # Look up every 1-3 word phrase so multi-word skills like "machine learning" match
+        for size in (1, 2, 3):
+            for start in range(len(words) - size + 1):
+                phrase = " ".join(words[start:start + size])
+                phrase = semantic_cache.SKILL_ALIASES.get(phrase, phrase)
+                if phrase in known:
+                    found.add(phrase)
+        self.skills = sorted(found)
+        # Skills no stored resume has still count towards coverage, they just match nobody
+        self.indices = [vocabulary[skill] for skill in self.skills if skill in vocabulary]
+        match = YEARS_COUNT_RE.search(text)
+        self.years = float(match.group(1)) if match else 0.0
+        self.education = education_level(text)
+
+
+def score(matrix, requirements):
+    """Vectorized scores in [0, 1] for every resume in the matrix"""
+    n = len(matrix)
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    if requirements.indices:
+        matched = matrix.skills[:, requirements.indices].sum(axis=1, dtype=np.float32)
+        skill_score = matched / len(requirements.skills)
+    else:
+        skill_score = np.zeros(n, dtype=np.float32)
+    if requirements.years:
+        experience_score = np.minimum(matrix.years / requirements.years, 1.0)
+    else:
+        experience_score = np.minimum(matrix.years / 10.0, 1.0)
+    education_score = (matrix.education >= requirements.education).astype(np.float32)
+    return SKILL_WEIGHT * skill_score + EXPERIENCE_WEIGHT * experience_score + EDUCATION_WEIGHT * education_score
+
+
+def top_k(scores, k, offset=0):
+    """Indices of the best scores from position offset to offset + k, best first"""
+    end = min(len(scores), offset + k)
+    if end <= offset:
+        return np.zeros(0, dtype=np.int64)
+    if end < len(scores):
+        candidates = np.argpartition(-scores, end - 1)[:end]
+    else:
+        candidates = np.arange(len(scores))
+    ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return ordered[offset:end]
+
+
+class ResumeStore:
+    """Append-only JSON-lines store of parsed resumes with a cached feature matrix.
+
+    A resume appended with the identity of an earlier one (see resume_identity)
+    replaces it in the feature matrix.
+    """
+
+    # Bytes before the read offset that must be unchanged for new bytes to count as an append
+    TAIL_BYTES = 64
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._version = None
+        self._offset = 0    # bytes of complete lines already in the matrix
+        self._tail = b""    # the TAIL_BYTES bytes before self._offset
+
+    def add(self, resume):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(resume) + "\n")
+
+    def _file_version(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _read(self, offset):
+        """Resumes in the complete lines from offset on, and the bytes those lines span"""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except OSError:
+            return [], b""
+        # A line still being written is picked up on a later read
+        data = data[:data.rfind(b"\n") + 1]
+        resumes = []
+        for line in data.splitlines():
+            line = line.strip()
+            if line:
+                try:
+                    resumes.append(json.loads(line))
+                except ValueError:
+                    continue
+        return resumes, data
+
+    def _appended(self, version):
+        """Whether the file only grew since the last read (not truncated or rewritten)"""
+        if self._version is None or version is None or version[0] != self._version[0] or version[2] < self._offset:
+            return False
+        start = self._offset - len(self._tail)
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                return f.read(len(self._tail)) == self._tail
+        except OSError:
+            return False
+
+    def load(self):
+        return self._read(0)[0]
+
+    def features(self):
+        """Return the feature matrix, adding appended resumes to it incrementally.
+
+        The matrix is only rebuilt from scratch when the file was truncated or
+        rewritten.
+        """
+        with self._lock:
+            version = self._file_version()
+            if self._matrix is not None and version == self._version:
+                return self._matrix
+            if self._matrix is not None and self._appended(version):
+                resumes, data = self._read(self._offset)
+                if resumes:
+                    self._matrix = FeatureMatrix(resumes, base=self._matrix)
+                self._offset += len(data)
+                self._tail = (self._tail + data)[-self.TAIL_BYTES:]
+            else:
+                resumes, data = self._read(0)
+                self._matrix = FeatureMatrix(resumes)
+                self._offset = len(data)
+                self._tail = data[-self.TAIL_BYTES:]
+            self._version = version
+            return self._matrix
+
+
+def rank_resumes(job_description, matrix, top=10, page=1):
+    """Rank every resume in the matrix against a job description"""
+    requirements = JobRequirements(job_description, matrix.vocabulary)
+    # Rows replaced by a later parse of the same resume are not ranked
+    active = np.flatnonzero(matrix.active)
+    scores = score(matrix, requirements)[active]
+    positions = top_k(scores, top, offset=(max(page, 1) - 1) * top)
+    wanted = set(requirements.skills)
+    candidates = []
+    for rank, position in enumerate(positions, start=(max(page, 1) - 1) * top + 1):
+        index = active[position]
+        resume = matrix.resumes[index]
+        candidates.append({
+            "rank": rank,
+            "score": round(float(scores[position]) * 100, 1),
+            "name": resume.get("name", "Not found"),
+            "email": resume.get("email", "Not found"),
+            "matched_skills": sorted(wanted.intersection(resume_skills(resume))),
+            "years_experience": float(matrix.years[index]),
+            "education_level": int(matrix.education[index]),
+        })
+    return {
+        "total_resumes": len(active),
+        "page": max(page, 1),
+        "page_size": top,
+        "requirements": {
+            "skills": requirements.skills,
+            "years": requirements.years,
+            "education_level": requirements.education,
+        },
+        "candidates": candidates,
+    }
+
+
+store = ResumeStore(config.RESUME_STORE_PATH)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank stored parsed resumes against a job description")
+    parser.add_argument("job_description", nargs="?", help="Job description text")
+    parser.add_argument("--jd-file", help="Read the job description from a file")
+    parser.add_argument("--top", type=int, default=10, help="Candidates per page")
+    parser.add_argument("--page", type=int, default=1)
+    parser.add_argument("--store", default=config.RESUME_STORE_PATH, help="Path to the parsed resume store")
+    args = parser.parse_args()
+
+    if args.jd_file:
+        with open(args.jd_file, "r", encoding="utf-8") as f:
+            job_description = f.read()
+    else:
+        job_description = args.job_description or ""
+    result = rank_resumes(job_description, ResumeStore(args.store).features(), top=args.top, page=args.page)
+    print(json.dumps(result, indent=2))
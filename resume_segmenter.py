@@ -0,0 +1,220 @@
+import re
+
+# Single-pass, line-oriented resume segmenter. Every pattern below has bounded
+# quantifiers and is applied to one line at a time, so the total work is
+# linear in the size of the text regardless of how the input is laid out.
+
+SECTION_HEADINGS = {
+    "education": "education",
+    "academic background": "education",
+    "academic qualifications": "education",
+    "qualifications": "education",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment": "experience",
+    "employment history": "experience",
+    "work history": "experience",
+    "career history": "experience",
+    "skills": "skills",
+    "technical skills": "skills",
+    "core competencies": "skills",
+    "projects": "projects",
+    "summary": "summary",
+    "professional summary": "summary",
+    "profile": "summary",
+    "objective": "summary",
+    "certifications": "certifications",
+    "awards": "other",
+    "publications": "other",
+    "languages": "other",
+    "interests": "other",
+    "references": "other",
+    "contact": "other",
+}
+
+DEGREE_WORDS = {
+    "bachelor", "bachelors", "master", "masters", "phd", "ph.d", "doctorate", "mba",
+    "b.s", "m.s", "b.a", "m.a", "bsc", "msc", "b.sc", "m.sc", "b.tech", "m.tech", "b.e",
+    "associate", "diploma",
+}
+INSTITUTION_WORDS = {"university", "college", "institute", "school", "academy", "polytechnic"}
+TITLE_WORDS = {
+    "engineer", "developer", "programmer", "manager", "analyst", "consultant", "designer",
+    "scientist", "architect", "intern", "director", "administrator", "specialist", "lead",
+}
+COMPANY_WORDS = {
+    "inc", "corp", "corporation", "llc", "ltd", "company", "co", "gmbh", "plc",
+    "technologies", "labs", "solutions",
+}
+
+BULLET_CHARS = "•-*▪●◦–·"
+MAX_RESPONSIBILITIES = 10
+MAX_ENTRIES = 50  # per section; keeps output bounded on adversarial input
+
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z.&+#]{0,40}")
+_PART_SPLIT_RE = re.compile(
+    r"\s{1,5}[|@–—-]\s{1,5}|\s{1,5}at\s{1,5}|,\s{0,5}(?!(?i:inc|llc|ltd|corp|co)\b)|\t|\s{3,}"
+)
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]{0,6}\.?"
+_DATE = rf"(?:{_MONTH}\s{{1,3}}|\d{{1,2}}/)?(?:19|20)\d\d"
+_DATE_RANGE_RE = re.compile(
+    rf"({_DATE})\s{{0,3}}(?:-|–|—|to)\s{{0,3}}({_DATE}|present|current|now)",
+    re.IGNORECASE,
+)
+_YEAR_RE = re.compile(r"\b(?:19|20)\d\d\b")
+# Longest text a date can have before its year ("september.   ")
+_DATE_PREFIX = 13
+# Characters str.splitlines() breaks on
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+def _range_search_start(text):
+    starts = [i for i in (text.find("19"), text.find("20")) if i >= 0]
+    return max(0, min(starts) - _DATE_PREFIX) if starts else len(text)
+
+
+def _words(lowered):
+    words = set(_WORD_RE.findall(lowered))
+    if "." in lowered:
+        words = {w.rstrip(".") for w in words}
+    return words
+
+
+class Line:
+    """Tokens and features of one line of resume text"""
+
+    __slots__ = ("text", "words", "heading", "bullet", "date_range", "year",
+                 "degree", "institution", "title", "company", "_parts")
+
+    def __init__(self, text):
+        self.text = text
+        self._parts = None
+        stripped = text.strip()
+        lowered = stripped.lower()
+        self.bullet = bool(stripped) and stripped[0] in BULLET_CHARS
+        self.heading = SECTION_HEADINGS.get(lowered.rstrip(":").strip()) if len(lowered) <= 40 else None
+
+        self.words = _words(lowered)
+        year = _YEAR_RE.search(text)
+        self.year = year.group(0) if year else None
+        # The date range pattern is only worth running on lines that contain a year,
+        # and no range starts more than a month name before the first "19" or "20"
+        match = _DATE_RANGE_RE.search(text, _range_search_start(text)) if year else None
+        self.date_range = f"{match.group(1)} - {match.group(2)}" if match else None
+        self.degree = not self.words.isdisjoint(DEGREE_WORDS)
+        self.institution = not self.words.isdisjoint(INSTITUTION_WORDS)
+        self.title = not self.words.isdisjoint(TITLE_WORDS)
+        self.company = not self.words.isdisjoint(COMPANY_WORDS)
+
+    def _split(self):
+        # (part, words) pairs, computed once per line and only for lines that need them
+        if self._parts is None:
+            parts = (p.strip(" \t•-*") for p in _PART_SPLIT_RE.split(self.text.strip()))
+            self._parts = [(p, _words(p.lower())) for p in parts if p]
+        return self._parts
+
+    def parts(self):
+        """Split the line on common separators ("|", " at ", commas, dashes)"""
+        return [part for part, _ in self._split()]
+
+    def part_with(self, vocabulary):
+        for part, words in self._split():
+            if not words.isdisjoint(vocabulary):
+                return part
+        return None
+
+
+def lines_from_chunks(chunks):
+    """Yield the lines of text arriving in chunks (pages) that may split a line"""
+    partial = ""
+    for chunk in chunks:
+        text = partial + chunk
+        lines = text.splitlines()
+        partial = ""
+        if lines and text[-1] not in _LINE_BREAKS:
+            # No line break at the end: the line continues in the next chunk
+            partial = lines.pop()
+        yield from lines
+    if partial:
+        yield partial
+
+
+def iter_lines(lines):
+    """Yield Line objects for each non-blank line"""
+    for raw in lines:
+        if raw.strip():
+            yield Line(raw)
+
+
+def segment_resume(text):
+    """Segment resume text into education and experience entries in one pass"""
+    return segment_lines(text.splitlines())
+
+
+def segment_lines(lines):
+    """Segment an iterable of resume lines into education and experience entries"""
+    education = []
+    experience = []
+    section = None
+    last_education = None
+    last_education_line = -10
+    last_job = None
+
+    for index, line in enumerate(iter_lines(lines)):
+        if line.heading:
+            section = line.heading
+            last_job = None
+            continue
+
+        if line.degree and not line.bullet and len(education) < MAX_ENTRIES:
+            last_education = {
+                "degree": line.part_with(DEGREE_WORDS) or line.text.strip(),
+                "institution": line.part_with(INSTITUTION_WORDS) or "Not specified",
+                "years": line.date_range or line.year or "Not specified",
+            }
+            last_education_line = index
+            education.append(last_education)
+            continue
+
+        if last_education is not None and index - last_education_line <= 2:
+            # Institution or dates often sit on the line after the degree
+            if line.institution and last_education["institution"] == "Not specified":
+                last_education["institution"] = line.part_with(INSTITUTION_WORDS)
+                if last_education["years"] == "Not specified" and (line.date_range or line.year):
+                    last_education["years"] = line.date_range or line.year
+                continue
+            if last_education["years"] == "Not specified" and (line.date_range or line.year) and not line.title:
+                last_education["years"] = line.date_range or line.year
+                continue
+
+        in_experience = section == "experience"
+        if line.title and not line.bullet and (in_experience or line.company) and len(experience) < MAX_ENTRIES:
+            title = line.part_with(TITLE_WORDS) or line.text.strip()
+            company = line.part_with(COMPANY_WORDS)
+            if company is None and in_experience:
+                others = [p for p in line.parts() if p != title and not _DATE_RANGE_RE.search(p)]
+                company = others[0] if others else None
+            last_job = {
+                "job_role": title,
+                "company": company or "Not specified",
+                "duration": line.date_range or "Not specified",
+                "responsibilities": [],
+            }
+            experience.append(last_job)
+            continue
+
+        if last_job is not None and in_experience:
+            if line.bullet:
+                if len(last_job["responsibilities"]) < MAX_RESPONSIBILITIES:
+                    last_job["responsibilities"].append(line.text.strip().lstrip(BULLET_CHARS).strip())
+            elif line.company and last_job["company"] == "Not specified":
+                last_job["company"] = line.part_with(COMPANY_WORDS)
+            if line.date_range and last_job["duration"] == "Not specified":
+                last_job["duration"] = line.date_range
+
+    for job in experience:
+        if not job["responsibilities"]:
+            job["responsibilities"] = ["Responsibility details not extracted"]
+
+    return {"education": education, "experience": experience}
@@ -0,0 +1,313 @@
+import copy
+import hashlib
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import config
+
+# Role aliases map common spellings and abbreviations to one canonical role
+ROLE_ALIASES = {
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "software developer": "software engineer",
+    "software dev": "software engineer",
+    "developer": "software engineer",
+    "programmer": "software engineer",
+    "ds": "data scientist",
+    "data science": "data scientist",
+    "ml engineer": "machine learning engineer",
+    "mle": "machine learning engineer",
+    "pm": "product manager",
+    "product owner": "product manager",
+    "devops": "devops engineer",
+    "sre": "site reliability engineer",
+    "ux designer": "ui/ux designer",
+    "ui designer": "ui/ux designer",
+    "ux/ui designer": "ui/ux designer",
+    "qa": "qa engineer",
+    "tester": "qa engineer",
+    "fe developer": "frontend developer",
+    "front end developer": "frontend developer",
+    "front-end developer": "frontend developer",
+    "be developer": "backend developer",
+    "back end developer": "backend developer",
+    "back-end developer": "backend developer",
+    "fullstack developer": "full stack developer",
+    "full-stack developer": "full stack developer",
+}
+
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "react.js": "react",
+    "reactjs": "react",
+    "vue": "vue.js",
+    "postgres": "postgresql",
+    "ml": "machine learning",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+}
+
+LEVEL_ALIASES = {
+    "intern": "entry",
+    "entry": "entry",
+    "entry-level": "entry",
+    "entry level": "entry",
+    "junior": "entry",
+    "graduate": "entry",
+    "mid": "mid",
+    "mid-level": "mid",
+    "mid level": "mid",
+    "intermediate": "mid",
+    "senior": "senior",
+    "sr": "senior",
+    "lead": "lead",
+    "principal": "lead",
+    "staff": "lead",
+}
+
+_SPACE_RE = re.compile(r"\s+")
+_SPLIT_RE = re.compile(r"[,;/|\n]+")
+_NUMBER_RE = re.compile(r"\d+(\.\d+)?")
+
+
+def _clean(text):
+    return _SPACE_RE.sub(" ", str(text or "")).strip().lower().rstrip(".")
+
+
+def canonical_role(role):
+    role = _clean(role)
+    return ROLE_ALIASES.get(role, role)
+
+
+def canonical_terms(text, aliases=None):
+    """Split a free-text list into a sorted, deduplicated tuple of canonical terms"""
+    aliases = aliases or {}
+    terms = set()
+    for part in _SPLIT_RE.split(str(text or "")):
+        term = _clean(part)
+        if term:
+            terms.add(aliases.get(term, term))
+    return tuple(sorted(terms))
+
+
+def experience_bucket(value):
+    """Bucket years of experience or a level name into a coarse band"""
+    text = _clean(value)
+    if not text:
+        return ""
+    if text in LEVEL_ALIASES:
+        return LEVEL_ALIASES[text]
+    match = _NUMBER_RE.search(text)
+    if match:
+        years = float(match.group(0))
+        if years < 2:
+            return "entry"
+        if years < 5:
+            return "mid"
+        if years < 10:
+            return "senior"
+        return "lead"
+    for word, level in LEVEL_ALIASES.items():
+        if word in text:
+            return level
+    return text
+
+
+class CacheKey:
+    """Canonical form of a request: exact tuple plus token set for near-duplicate lookup.
+
+    Near-duplicate lookup only compares keys with the same partition, so the
+    fields in it must match exactly and only the tokens are fuzzy.
+    """
+
+    def __init__(self, exact, tokens, partition=None):
+        self.exact = exact
+        self.tokens = frozenset(tokens)
+        self.partition = partition
+
+
+def guidance_key(current_role, experience_years, skills, interests):
+    role = canonical_role(current_role)
+    bucket = experience_bucket(experience_years)
+    skill_terms = canonical_terms(skills, SKILL_ALIASES)
+    interest_terms = canonical_terms(interests)
+    # Role and experience band must match exactly; only skills and interests are fuzzy
+    tokens = [f"skill:{s}" for s in skill_terms] + [f"interest:{i}" for i in interest_terms]
+    return CacheKey((role, bucket, skill_terms, interest_terms), tokens, partition=(role, bucket))
+
+
+def questions_key(job_role, experience_level):
+    role = canonical_role(job_role)
+    bucket = experience_bucket(experience_level)
+    tokens = [f"role:{role}", f"exp:{bucket}"] + [f"word:{w}" for w in role.split()]
+    return CacheKey((role, bucket), tokens)
+
+
+def jobs_key(job_position, location, skills):
+    role = canonical_role(job_position)
+    place = _clean(location) or "anywhere"
+    skill_terms = canonical_terms(skills, SKILL_ALIASES)
+    # Listings are never shared across locations or roles; only skills are fuzzy
+    return CacheKey((role, place, skill_terms), [f"skill:{s}" for s in skill_terms], partition=(place, role))
+
+
+def resume_key(text):
+    """Exact hash of the normalized resume text plus its word shingles"""
+    words = _clean(text).split()
+    size = config.RESUME_DEDUP_SHINGLE_WORDS
+    shingles = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+    return CacheKey(hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest(), shingles)
+
+
+class MinHasher:
+    """MinHash signatures over token sets using seeded universal hashing"""
+
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, num_perm=64, seed=1):
+        state = seed
+        self._params = []
+        for _ in range(num_perm):
+            # Small LCG so signatures are stable across processes
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = state % self._PRIME or 1
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            b = state % self._PRIME
+            self._params.append((a, b))
+
+    def signature(self, tokens):
+        hashes = [zlib.crc32(token.encode("utf-8")) for token in tokens] or [0]
+        prime = self._PRIME
+        return tuple(min((a * h + b) % prime for h in hashes) for a, b in self._params)
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class SemanticCache:
+    """LRU result cache keyed by canonical requests with a MinHash LSH second tier"""
+
+    def __init__(self, max_entries=1000, ttl=3600, threshold=0.8, num_perm=64, bands=16):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._hasher = MinHasher(num_perm)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # (feature, exact) -> (expires_at, signature, value, partition)
+        self._buckets = {}              # (feature, partition, band, band_hash) -> set of exact keys
+        self._stats = {}
+
+    def _band_keys(self, feature, partition, signature):
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            yield (feature, partition, band, hash(chunk))
+
+    def _feature_stats(self, feature):
+        if feature not in self._stats:
+            self._stats[feature] = {"lookups": 0, "exact_hits": 0, "near_hits": 0, "stores": 0}
+        return self._stats[feature]
+
+    def _remove(self, entry_key):
+        # Caller holds self._lock
+        _, signature, _, partition = self._entries.pop(entry_key)
+        feature, exact = entry_key
+        for band_key in self._band_keys(feature, partition, signature):
+            members = self._buckets.get(band_key)
+            if members:
+                members.discard(exact)
+                if not members:
+                    del self._buckets[band_key]
+
+    def get(self, feature, key):
+        """Return a copy of the cached value for key, or None"""
+        now = time.time()
+        with self._lock:
+            stats = self._feature_stats(feature)
+            stats["lookups"] += 1
+            entry_key = (feature, key.exact)
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(entry_key)
+                    stats["exact_hits"] += 1
+                    return copy.deepcopy(entry[2])
+                self._remove(entry_key)
+
+        # Only exact misses pay for the signature
+        signature = self._hasher.signature(key.tokens)
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(feature, key.partition, signature):
+                candidates.update(self._buckets.get(band_key, ()))
+            best = None
+            best_score = self.threshold
+            for exact in candidates:
+                expires_at, candidate_sig, value, _ = self._entries[(feature, exact)]
+                if expires_at <= now:
+                    continue
+                score = MinHasher.similarity(signature, candidate_sig)
+                if score >= best_score:
+                    best, best_score = value, score
+            if best is not None:
+                stats["near_hits"] += 1
+                return copy.deepcopy(best)
+            return None
+
+    def expires_in(self, feature, key):
+        """Seconds until the exact entry for key expires, or None if it is not cached"""
+        with self._lock:
+            entry = self._entries.get((feature, key.exact))
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[0] - time.time()
+
+    def put(self, feature, key, value):
+        signature = self._hasher.signature(key.tokens)
+        with self._lock:
+            entry_key = (feature, key.exact)
+            if entry_key in self._entries:
+                self._remove(entry_key)
+            self._entries[entry_key] = (time.time() + self.ttl, signature, copy.deepcopy(value), key.partition)
+            for band_key in self._band_keys(feature, key.partition, signature):
+                self._buckets.setdefault(band_key, set()).add(key.exact)
+            self._feature_stats(feature)["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def stats(self):
+        """Hit rates by feature"""
+        with self._lock:
+            report = {}
+            for feature, stats in self._stats.items():
+                hits = stats["exact_hits"] + stats["near_hits"]
+                report[feature] = dict(stats, hit_rate=round(hits / stats["lookups"], 3) if stats["lookups"] else 0.0)
+            return {"entries": len(self._entries), "features": report}
+
+
+cache = SemanticCache(
+    max_entries=config.SEMANTIC_CACHE_MAX_ENTRIES,
+    ttl=config.SEMANTIC_CACHE_TTL,
+    threshold=config.SEMANTIC_CACHE_NEAR_THRESHOLD,
+)
+
+# Parsed resumes by text fingerprint. Fewer, wider bands than the request cache
+# so only resumes that share most of their shingles become candidates.
+resume_cache = SemanticCache(
+    max_entries=config.RESUME_DEDUP_MAX_ENTRIES,
+    ttl=config.RESUME_DEDUP_TTL,
+    threshold=config.RESUME_DEDUP_THRESHOLD,
+    bands=8,
+)
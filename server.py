@@ -0,0 +1,52 @@
+"""Production entrypoint: python server.py
+
+Runs the Flask app under gunicorn. Handlers spend most of their time blocked on
+the LLM, so throughput comes from concurrent requests per worker: the default
+"gthread" worker serves SERVER_THREADS requests at once per process, and
+SERVER_WORKER_CLASS=gevent switches to cooperative greenlets (requires gevent).
+`python app.py` remains the development server.
+"""
+from gunicorn.app.base import BaseApplication
+
+import config
+from app import app
+
+
+def _post_worker_init(worker):
+    # gRPC (used by the Gemini SDK) needs its own hooks to cooperate with gevent
+    if config.SERVER_WORKER_CLASS == 'gevent':
+        import grpc.experimental.gevent as grpc_gevent
+        grpc_gevent.init_gevent()
+
+
+class ProductionServer(BaseApplication):
+    def __init__(self, application, options=None):
+        self.application = application
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def server_options():
+    options = {
+        'bind': config.SERVER_BIND,
+        'workers': config.SERVER_WORKERS,
+        'worker_class': config.SERVER_WORKER_CLASS,
+        'timeout': config.SERVER_TIMEOUT,
+        'post_worker_init': _post_worker_init,
+    }
+    if config.SERVER_WORKER_CLASS == 'gthread':
+        options['threads'] = config.SERVER_THREADS
+    elif config.SERVER_WORKER_CLASS == 'gevent':
+        options['worker_connections'] = config.SERVER_THREADS
+    return options
+
+
+if __name__ == '__main__':
+    ProductionServer(app, server_options()).run()
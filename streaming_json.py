@@ -0,0 +1,66 @@
+import json
+
+# Incremental extraction of array elements from JSON text that arrives in
+# chunks, such as a streamed LLM response shaped like {"jobs": [{...}, {...}]}.
+# Text outside the first array (markdown fences, the opening key) is skipped,
+# and consumed text is dropped so the buffer holds at most one element.
+
+
+class ArrayItemParser:
+    """Yield each object of the first JSON array as soon as its closing brace arrives"""
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0          # nesting depth of objects and arrays
+        self._array_depth = None  # depth inside the target array
+        self._item_start = None
+        self._in_string = False
+        self._escape = False
+        self.done = False
+
+    def feed(self, chunk):
+        """Consume a chunk of text and return the objects it completed"""
+        items = []
+        if self.done or not chunk:
+            return items
+        self._buffer += chunk
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._array_depth is None:
+                    self._array_depth = self._depth
+                elif char == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._item_start = i
+            elif char in "}]":
+                if char == "}" and self._item_start is not None and self._depth == self._array_depth + 1:
+                    try:
+                        items.append(json.loads(buffer[self._item_start:i + 1]))
+                    except ValueError as e:
+                        print(f"[WARNING] Skipping malformed streamed item: {str(e)}")
+                    self._item_start = None
+                elif char == "]" and self._depth == self._array_depth:
+                    self.done = True
+                    break
+                self._depth -= 1
+            i += 1
+
+        # Keep only the unfinished element, if any
+        keep_from = self._item_start if self._item_start is not None else i
+        self._buffer = buffer[keep_from:]
+        if self._item_start is not None:
+            self._item_start = 0
+        self._pos = i - keep_from
+        return items
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import admission  # noqa: E402
+import config  # noqa: E402
+import llm_router  # noqa: E402
+import llm_stub  # noqa: E402
+import usage  # noqa: E402
+from deadline import Deadline, DeadlineExceeded  # noqa: E402
+
+
+class AdmissionRecoveryTest(unittest.TestCase):
+    def test_recovered_system_is_admitted_again(self):
+        controller = admission.AdmissionController(
+            max_queue_wait=0.05, route_limits={"jobs": 1}, queue_wait_half_life=0.1,
+        )
+        holder = controller.admit("jobs")
+        self.assertEqual(holder.decision, admission.ADMITTED)
+
+        # Queue behind the held slot until the average wait crosses the limit
+        for _ in range(30):
+            ticket = controller.admit("jobs")
+            if ticket.queue_wait == 0.0:
+                break
+        self.assertEqual(controller.admit("jobs").decision, admission.DEGRADED)
+
+        holder.release()
+        time.sleep(0.5)
+        with controller.admit("jobs") as ticket:
+            self.assertEqual(ticket.decision, admission.ADMITTED)
+        self.assertLess(controller.snapshot()["avg_queue_wait"], 0.05)
+
+
+class AbandonedCallTest(unittest.TestCase):
+    @mock.patch.object(usage, "store", usage.UsageStore(":memory:"))
+    def test_abandoned_llm_call_keeps_its_slot_until_it_finishes(self):
+        controller = admission.AdmissionController(route_limits={"jobs": 1})
+        router = llm_router.Router(routes={"find_jobs": ["stub:slow"]},
+                                   clients={"stub:slow": llm_stub.StubModel("find_jobs", latency=0.5)}, hedge=False)
+        ticket = controller.admit("jobs")
+        admission.set_current(ticket)
+        with mock.patch.object(config, "DEADLINE_MIN_LLM_SECONDS", 0.05), self.assertRaises(DeadlineExceeded):
+            router.generate("find_jobs", "prompt", Deadline(0.1, reserve=0.0))
+        ticket.release()
+        self.assertIsNone(admission.current())
+        self.assertEqual(controller.snapshot()["inflight"], 1)
+        time.sleep(0.7)
+        self.assertEqual(controller.snapshot()["inflight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import job_matcher  # noqa: E402
+import llm_router  # noqa: E402
+import llm_stub  # noqa: E402
+import semantic_cache  # noqa: E402
+import usage  # noqa: E402
+
+
+class PackedBatchTest(unittest.TestCase):
+    def setUp(self):
+        router = llm_router.Router(routes={"find_jobs": ["stub:jobs"]},
+                                   clients={"stub:jobs": llm_stub.StubModel("find_jobs", latency=0.0)}, hedge=False)
+        for target, name, value in [(llm_router, "router", router), (semantic_cache, "cache", semantic_cache.SemanticCache()),
+                                    (usage, "store", usage.UsageStore(":memory:")), (job_matcher, "GENAI_AVAILABLE", True)]:
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_batch(self, queries):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return job_matcher.find_job_matches_batch(queries)
+
+    def test_packed_answers_are_cached_and_reused(self):
+        queries = [{"job_position": f"Engineer {i}", "location": "Berlin", "skills": "Python"} for i in range(9)]
+        first = self.run_batch(queries)
+        self.assertEqual(first["stats"]["fallbacks"], 0)
+        self.assertLess(first["stats"]["llm_calls"], len(queries))
+        self.assertTrue(all(result["result"]["jobs"] for result in first["results"]))
+
+        second = self.run_batch(queries + [{"job_position": "Designer", "location": "Berlin", "skills": "Figma"}])
+        self.assertEqual(second["stats"]["cache_hits"], len(queries))
+        self.assertEqual(second["stats"]["llm_calls"], 1)
+        self.assertEqual(second["stats"]["fallbacks"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
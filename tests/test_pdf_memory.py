@@ -0,0 +1,54 @@
+import contextlib
+import io
+import os
+import sys
+import tracemalloc
+import unittest
+
+import fitz
+from werkzeug.datastructures import FileStorage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import resume_parser  # noqa: E402
+
+# Maximum traced peak for parsing one upload, in MB
+PEAK_BUDGET_MB = 8.0
+
+PAGE_TEXT = "\n".join([
+    "Jane Doe | jane.doe@example.com | 555-123-4567",
+    "Senior Software Engineer | Acme Corp | Jan 2019 - Present",
+    "• Built payment APIs in Python and Go, running on AWS with Docker",
+    "Bachelor of Science in Computer Science, State University, 2011 - 2015",
+] * 40)
+
+
+class PdfMemoryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Well past both extraction budgets: 400 pages of about 10k characters
+        doc = fitz.open()
+        for _ in range(400):
+            doc.new_page().insert_text((20, 20), PAGE_TEXT, fontsize=4)
+        cls.pdf = doc.tobytes()
+        doc.close()
+        assert 400 * len(PAGE_TEXT) > config.PDF_MAX_CHARS
+
+    def test_large_upload_stays_within_the_peak_budget(self):
+        upload = FileStorage(io.BytesIO(self.pdf), filename="large.pdf")
+        with contextlib.redirect_stdout(io.StringIO()):
+            tracemalloc.start()
+            try:
+                result = resume_parser.parse_resume_file(upload, use_ai=False)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        self.assertNotIn("error", result)
+        self.assertEqual(result["email"], "jane.doe@example.com")
+        self.assertLess(peak / 1e6, PEAK_BUDGET_MB)
+
+
+if __name__ == "__main__":
+    unittest.main()
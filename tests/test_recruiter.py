@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recruiter  # noqa: E402
+
+
+class ResumeStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = recruiter.ResumeStore(os.path.join(self.directory.name, "parsed_resumes.jsonl"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def rank(self, job_description):
+        return recruiter.rank_resumes(job_description, self.store.features())
+
+    def test_reupload_replaces_the_earlier_parse(self):
+        resume = {"name": "Jane Doe", "email": "jane@example.com", "skills": ["Python"]}
+        self.store.add(resume)
+        self.assertEqual(self.rank("Python")["total_resumes"], 1)
+
+        self.store.add(dict(resume, email="JANE@example.com", skills=["Python", "AWS"], deduplicated=True))
+        result = self.rank("Python and AWS")
+        self.assertEqual(result["total_resumes"], 1)
+        self.assertEqual(result["candidates"][0]["matched_skills"], ["aws", "python"])
+
+        # A fresh store rebuilds the same view from the file
+        reloaded = recruiter.ResumeStore(self.store.path)
+        self.assertEqual(recruiter.rank_resumes("Python", reloaded.features())["total_resumes"], 1)
+
+    def test_parses_without_email_are_keyed_by_content(self):
+        basic = {"name": "Not found", "email": "Not found", "skills": ["Go"]}
+        self.store.add(dict(basic, parsed_date="2026-01-01 10:00:00"))
+        self.store.add(dict(basic, parsed_date="2026-01-02 10:00:00", degraded=True))
+        self.store.add(dict(basic, skills=["Rust"]))
+        self.assertEqual(self.rank("Go")["total_resumes"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
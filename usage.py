@@ -0,0 +1,219 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+import config
+
+# Token accounting for every LLM call. Each call adds its prompt and response
+# tokens (from the response's usage metadata, or estimated from the text when
+# the backend reports none) and latency to in-memory daily totals per user,
+# route and model. The totals are added to a local SQLite table in one
+# transaction every USAGE_FLUSH_SECONDS, so a call costs a dict update and
+# several worker processes can share the file.
+
+_local = threading.local()
+
+
+class BudgetExceeded(Exception):
+    """The user has used up today's token budget"""
+
+
+def set_user(user):
+    """Attribute LLM calls made on this thread to user (called per request)"""
+    _local.user = str(user) if user is not None else None
+
+
+def current_user():
+    return getattr(_local, "user", None)
+
+
+def today():
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+def estimate_tokens(text):
+    """Rough token count for backends that report no usage"""
+    if not text:
+        return 0
+    return max(1, int(len(text) / config.USAGE_CHARS_PER_TOKEN + 0.5))
+
+
+def response_tokens(prompt, response, text=None):
+    """(prompt tokens, response tokens, estimated) for one LLM response"""
+    meta = getattr(response, "usage_metadata", None)
+    if meta is not None and getattr(meta, "prompt_token_count", None):
+        return meta.prompt_token_count, getattr(meta, "candidates_token_count", 0) or 0, False
+    if text is None:
+        try:
+            text = response.text
+        except Exception:
+            text = ""
+    return estimate_tokens(prompt), estimate_tokens(text), True
+
+
+def price(model_key, prompt_tokens, response_tokens):
+    """Cost in USD from config.USAGE_PRICES (per million tokens); 0 for unknown models"""
+    model = model_key.partition(":")[2] or model_key
+    input_price, output_price = config.USAGE_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + response_tokens * output_price) / 1_000_000
+
+
+def budget_for(user):
+    """Daily token budget of user; 0 means unlimited"""
+    return config.USAGE_USER_BUDGETS.get(user, config.USAGE_DAILY_TOKEN_BUDGET)
+
+
+class UsageStore:
+    """Daily LLM usage per user, route and model, kept in a SQLite file"""
+
+    def __init__(self, path=None, flush_seconds=None):
+        self.path = path or config.USAGE_DB_PATH
+        self.flush_seconds = config.USAGE_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._pending = {}        # (day, user, route, model) -> [calls, prompt, response, latency, estimated]
+        self._pending_users = {}  # (day, user) -> tokens not yet written
+        self._flushed_users = {}  # (day, user) -> tokens already in the table
+        self._flushed_day = None
+        self._last_flush = time.monotonic()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                " day TEXT, user TEXT, route TEXT, model TEXT,"
+                " calls INTEGER, prompt_tokens INTEGER, response_tokens INTEGER,"
+                " latency REAL, estimated INTEGER,"
+                " PRIMARY KEY (day, user, route, model))"
+            )
+        return self._conn
+
+    def record(self, user, route, model, prompt_tokens, response_tokens, latency, estimated=False):
+        day = today()
+        user = user or "anonymous"
+        with self._lock:
+            row = self._pending.setdefault((day, user, route, model), [0, 0, 0, 0.0, 0])
+            row[0] += 1
+            row[1] += prompt_tokens
+            row[2] += response_tokens
+            row[3] += latency
+            row[4] += bool(estimated)
+            self._pending_users[(day, user)] = self._pending_users.get((day, user), 0) + prompt_tokens + response_tokens
+            due = time.monotonic() - self._last_flush >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Add pending totals to the table and reload today's per-user totals.
+
+        The SQLite file is only created once there is something to write.
+        """
+        with self._db_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                pending_users, self._pending_users = self._pending_users, {}
+                self._last_flush = time.monotonic()
+            day = today()
+            if not pending and self._conn is None and not os.path.exists(self.path):
+                # Nothing to write and no table to read totals from: do not create the file
+                with self._lock:
+                    self._flushed_users = {}
+                    self._flushed_day = day
+                return
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO usage VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                        " ON CONFLICT (day, user, route, model) DO UPDATE SET"
+                        " calls = calls + excluded.calls,"
+                        " prompt_tokens = prompt_tokens + excluded.prompt_tokens,"
+                        " response_tokens = response_tokens + excluded.response_tokens,"
+                        " latency = latency + excluded.latency,"
+                        " estimated = estimated + excluded.estimated",
+                        [key + tuple(row) for key, row in pending.items()],
+                    )
+                # Includes what other worker processes wrote
+                totals = conn.execute(
+                    "SELECT user, SUM(prompt_tokens + response_tokens) FROM usage WHERE day = ? GROUP BY user",
+                    (day,),
+                ).fetchall()
+            except sqlite3.Error as e:
+                print(f"[ERROR] Could not write LLM usage: {str(e)}")
+                # Keep the totals for the next flush
+                with self._lock:
+                    for key, row in pending.items():
+                        merged = self._pending.setdefault(key, [0, 0, 0, 0.0, 0])
+                        for i, value in enumerate(row):
+                            merged[i] += value
+                    for key, tokens in pending_users.items():
+                        self._pending_users[key] = self._pending_users.get(key, 0) + tokens
+                    self._flushed_day = day
+                return
+            with self._lock:
+                self._flushed_users = {(day, user): tokens for user, tokens in totals}
+                self._flushed_day = day
+
+    def tokens_today(self, user):
+        day = today()
+        user = user or "anonymous"
+        if self._flushed_day != day:
+            self.flush()
+        with self._lock:
+            return self._flushed_users.get((day, user), 0) + self._pending_users.get((day, user), 0)
+
+    def within_budget(self, user):
+        budget = budget_for(user or "anonymous")
+        return not budget or self.tokens_today(user) < budget
+
+    def report(self, day=None, by="user"):
+        """Totals for one day grouped by user, route or model, with estimated cost"""
+        if by not in ("user", "route", "model"):
+            raise ValueError("by must be one of user, route, model")
+        self.flush()
+        day = day or today()
+        with self._db_lock:
+            rows = self._connect().execute(
+                f"SELECT {by}, model, SUM(calls), SUM(prompt_tokens), SUM(response_tokens), SUM(latency), SUM(estimated)"
+                f" FROM usage WHERE day = ? GROUP BY {by}, model",
+                (day,),
+            ).fetchall()
+        groups = {}
+        for name, model, calls, prompt_tokens, response_tokens, latency, estimated in rows:
+            group = groups.setdefault(name, {"calls": 0, "prompt_tokens": 0, "response_tokens": 0,
+                                             "latency": 0.0, "estimated_calls": 0, "cost_usd": 0.0})
+            group["calls"] += calls
+            group["prompt_tokens"] += prompt_tokens
+            group["response_tokens"] += response_tokens
+            group["latency"] += latency
+            group["estimated_calls"] += estimated
+            group["cost_usd"] += price(model, prompt_tokens, response_tokens)
+        for group in groups.values():
+            group["avg_latency"] = round(group.pop("latency") / group["calls"], 3) if group["calls"] else None
+            group["cost_usd"] = round(group["cost_usd"], 6)
+        return {"day": day, "by": by, "groups": groups}
+
+
+store = UsageStore()
+atexit.register(store.flush)
+
+
+def record_response(user, route, model, prompt, response, latency, text=None):
+    """Account for one LLM response; accounting errors never fail the call"""
+    try:
+        prompt_tokens, completion_tokens, estimated = response_tokens(prompt, response, text)
+        store.record(user, route, model, prompt_tokens, completion_tokens, latency, estimated)
+    except Exception as e:
+        print(f"[ERROR] Could not record LLM usage: {str(e)}")
+
+
+def check_budget(user):
+    """Raise BudgetExceeded once user has spent today's tokens"""
+    if not store.within_budget(user):
+        raise BudgetExceeded(f"Daily LLM token budget of {budget_for(user or 'anonymous')} used up")